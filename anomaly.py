@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+
+EVENT_COLUMNS = [
+    'region', 'parameter', 'start', 'end', 'duration', 'threshold',
+    'max_anomaly', 'mean_anomaly', 'cumulative_anomaly'
+]
+
+
+def to_matrix(data):
+    wide = data.set_index(['region', 'parameter', 'date'])['value'].unstack('date')
+    return wide.index, pd.DatetimeIndex(wide.columns), wide.to_numpy(dtype=float)
+
+
+def climatology(values, months):
+    onehot = (months[:, None] == np.arange(1, 13)).astype(float)
+    observed = ~np.isnan(values)
+    sums = np.where(observed, values, 0.0) @ onehot
+    counts = observed.astype(float) @ onehot
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts
+
+
+def anomalies(values, dates):
+    months = np.asarray(dates.month)
+    clim = climatology(values, months)
+    return values - clim[:, months - 1], clim
+
+
+def find_runs(mask, min_duration):
+    padded = np.pad(mask, ((0, 0), (1, 1))).astype(np.int8)
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    keep = (ends - starts) >= min_duration
+    return rows[keep], starts[keep], ends[keep]
+
+
+def run_statistics(anomaly, rows, starts, ends):
+    n_series, n_times = anomaly.shape
+    filled = np.where(np.isnan(anomaly), 0.0, anomaly)
+    cumulative = np.concatenate(
+        [np.zeros((n_series, 1)), np.cumsum(filled, axis=1)], axis=1
+    )
+    total = cumulative[rows, ends] - cumulative[rows, starts]
+
+    # Pad each row with -inf so every run boundary is a valid reduceat index.
+    flat = np.concatenate(
+        [filled, np.full((n_series, 1), -np.inf)], axis=1
+    ).ravel()
+    width = n_times + 1
+    bounds = np.column_stack([rows * width + starts, rows * width + ends]).ravel()
+    peak = np.maximum.reduceat(flat, bounds)[::2] if len(bounds) else np.empty(0)
+
+    return peak, total / (ends - starts), total
+
+
+def scan_events(data, quantile=0.9, min_duration=2):
+    index, dates, values = to_matrix(data)
+    anomaly, _ = anomalies(values, dates)
+    quantile_fn = np.nanquantile if np.isnan(anomaly).any() else np.quantile
+    threshold = quantile_fn(anomaly, quantile, axis=1)
+    exceed = anomaly > threshold[:, None]
+
+    rows, starts, ends = find_runs(exceed, min_duration)
+    if len(rows) == 0:
+        return pd.DataFrame(columns=EVENT_COLUMNS)
+
+    peak, mean, total = run_statistics(anomaly, rows, starts, ends)
+    keys = index[rows]
+    return pd.DataFrame({
+        'region': keys.get_level_values('region'),
+        'parameter': keys.get_level_values('parameter'),
+        'start': dates[starts],
+        'end': dates[ends - 1],
+        'duration': ends - starts,
+        'threshold': threshold[rows],
+        'max_anomaly': peak,
+        'mean_anomaly': mean,
+        'cumulative_anomaly': total
+    }).sort_values(['start', 'region', 'parameter'], ignore_index=True)
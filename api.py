@@ -0,0 +1,241 @@
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+import trend
+from cache import LRUCache
+from exports import EXPORT_FORMATS, export_bytes
+from query import HARDCODED_QUESTIONS, RESPONSE_CACHE, get_response, resolve_prompt
+
+
+ARROW_MIME = EXPORT_FORMATS['arrow'][1]
+MAX_BODY_BYTES = 64 * 1024
+
+# Prompt resolution, model fits and figure serialization all run here, so the
+# event loop only parses requests and writes responses.
+EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('FLOATCHAT_API_WORKERS', os.cpu_count() or 4)),
+    thread_name_prefix='floatchat-api'
+)
+
+# Serialized response bodies per (response or analysis key, format). They expire
+# with the chat answers they were built from, so rollup- and trajectory-backed
+# answers pick up new ingests.
+BODY_CACHE = LRUCache(
+    max_entries=512,
+    ttl=RESPONSE_CACHE.ttl,
+    max_bytes=int(os.environ.get('FLOATCHAT_API_CACHE_MB', 128)) * 1024 * 1024
+)
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def frame_json(df):
+    return df.to_json(orient='split', index=False, date_format='iso')
+
+
+def json_body(payload, raw=None):
+    # Figure and table JSON is already serialized; splice it in rather than
+    # parsing it back into Python objects just to dump it again.
+    body = json.dumps(payload)
+    if raw:
+        body = body[:-1] + ''.join(
+            f", {json.dumps(name)}: {value}" for name, value in raw.items()
+        ) + '}'
+    return body.encode('utf-8')
+
+
+def chat_body(response_key, arrow):
+    def build():
+        response = get_response(response_key)
+        if arrow:
+            if 'dataframe' not in response:
+                raise HTTPError(406, 'This answer has no table to return as Arrow.')
+            return export_bytes(response['dataframe'], 'arrow')
+
+        raw = {}
+        if 'dataframe' in response:
+            raw['data'] = frame_json(response['dataframe'])
+        if 'plot_json' in response:
+            raw['figure'] = response['plot_json']
+        return json_body({
+            'response_key': response_key, 'type': response['type'],
+            'content': response['content']
+        }, raw)
+
+    return BODY_CACHE.get_or_compute((response_key, arrow), build)
+
+
+def trend_body(region, parameter, backend, arrow):
+    data = trend.load_trend_data(region, parameter)
+    series = trend.select_series(data, region, parameter)
+    if series.empty:
+        raise HTTPError(404, f"No series for {region} / {parameter}.")
+    key = trend.analysis_key(series, region, parameter, backend)
+
+    def build():
+        result = trend.analyze_series(data, region, parameter, backend)
+        if arrow:
+            return export_bytes(result['forecast'], 'arrow')
+        return json_body({
+            'region': region, 'parameter': parameter, 'backend': key[2]
+        }, {
+            'forecast': frame_json(result['forecast']),
+            'decomposition_figure': trend.plot_decomposition(
+                result['decomposition'], parameter
+            ).to_json(),
+            'forecast_figure': trend.plot_forecast(
+                result['forecast'], result['actual'], parameter
+            ).to_json(),
+        })
+
+    return BODY_CACHE.get_or_compute((key, arrow), build)
+
+
+def catalog_body():
+    return json_body({'questions': HARDCODED_QUESTIONS}, {
+        'series': frame_json(trend.series_catalog())
+    })
+
+
+async def read_json(receive):
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            raise HTTPError(400, 'Client disconnected.')
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            raise HTTPError(413, 'Request body too large.')
+        chunks.append(chunk)
+        if not message.get('more_body', False):
+            break
+    try:
+        payload = json.loads(b''.join(chunks) or b'{}')
+    except ValueError:
+        raise HTTPError(400, 'Request body is not valid JSON.')
+    if not isinstance(payload, dict):
+        raise HTTPError(400, 'Request body must be a JSON object.')
+    return payload
+
+
+async def run_blocking(function, *args):
+    return await asyncio.get_running_loop().run_in_executor(EXECUTOR, function, *args)
+
+
+async def handle_chat(receive, arrow):
+    payload = await read_json(receive)
+    prompt = payload.get('prompt')
+    if not isinstance(prompt, str) or not prompt.strip():
+        raise HTTPError(400, "Send a non-empty 'prompt'.")
+    response_key = resolve_prompt(prompt)
+    if response_key is None:
+        raise HTTPError(404, 'No answer matches this prompt.')
+    return await run_blocking(chat_body, response_key, arrow)
+
+
+async def handle_trend(receive, arrow):
+    payload = await read_json(receive)
+    region, parameter = payload.get('region'), payload.get('parameter')
+    if not isinstance(region, str) or not isinstance(parameter, str):
+        raise HTTPError(400, "Send 'region' and 'parameter'.")
+    backend = payload.get('backend')
+    if backend is not None and backend not in trend.FORECAST_BACKENDS:
+        raise HTTPError(400, f"Unknown backend: {backend}")
+    return await run_blocking(trend_body, region, parameter, backend, arrow)
+
+
+async def handle_catalog(receive, arrow):
+    return await run_blocking(catalog_body)
+
+
+async def handle_health(receive, arrow):
+    return json_body({'status': 'ok'})
+
+
+# (method, path) -> (handler returning the response body, can answer in Arrow).
+ROUTES = {
+    ('GET', '/health'): (handle_health, False),
+    ('GET', '/catalog'): (handle_catalog, False),
+    ('POST', '/chat'): (handle_chat, True),
+    ('POST', '/trend'): (handle_trend, True),
+}
+
+
+def wants_arrow(scope):
+    headers = dict(scope.get('headers', []))
+    accept = headers.get(b'accept', b'').decode('latin-1')
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    return ARROW_MIME in accept or query.get('format') == ['arrow']
+
+
+async def send_response(send, status, body, content_type):
+    await send({
+        'type': 'http.response.start', 'status': status,
+        'headers': [
+            (b'content-type', content_type.encode('latin-1')),
+            (b'content-length', str(len(body)).encode('latin-1')),
+        ]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            EXECUTOR.shutdown(wait=False, cancel_futures=True)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    if scope['type'] != 'http':
+        return
+
+    path = scope['path'].rstrip('/') or '/'
+    route = ROUTES.get((scope['method'], path))
+    try:
+        if route is None:
+            if any(route_path == path for _, route_path in ROUTES):
+                raise HTTPError(405, 'Method not allowed.')
+            raise HTTPError(404, 'Not found.')
+        handler, supports_arrow = route
+        arrow = supports_arrow and wants_arrow(scope)
+        body = await handler(receive, arrow)
+    except HTTPError as exc:
+        return await send_response(
+            send, exc.status, json_body({'error': exc.message}), 'application/json'
+        )
+    except Exception as exc:
+        return await send_response(
+            send, 500, json_body({'error': f"{type(exc).__name__}: {exc}"}),
+            'application/json'
+        )
+    await send_response(send, 200, body, ARROW_MIME if arrow else 'application/json')
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Serve the chat and trend engines over HTTP (requires uvicorn).'
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level='warning')
@@ -0,0 +1,111 @@
+import argparse
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import trend
+from cache import content_hash
+
+
+KEY_COLUMNS = ['region', 'parameter', 'backend', 'series_hash']
+RESULT_FRAMES = ['decomposition', 'forecast', 'models']
+
+
+def _forecast_task(task):
+    region, parameter, backend, series_hash, series = task
+    return trend.forecast_series(trend.to_prophet_frame(series), backend)
+
+
+def build_tasks(data, backend):
+    pairs = data[['region', 'parameter']].drop_duplicates()
+    tasks = []
+    for region, parameter in pairs.itertuples(index=False):
+        series = trend.select_series(data, region, parameter)
+        tasks.append((region, parameter, backend, content_hash(series), series))
+    return tasks
+
+
+def forecast_all(data, max_workers=None, backend=None):
+    tasks = build_tasks(data, backend or trend.DEFAULT_FORECAST_BACKEND)
+    decompositions, forecasts, models = [], [], []
+
+    # Decompositions are batched in this process; only forecasting fans out.
+    decomposed = trend.decompose_many([task[-1] for task in tasks])
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+        for task, decomposition, (model, forecast) in zip(
+            tasks, decomposed, pool.map(_forecast_task, tasks)
+        ):
+            keys = dict(zip(KEY_COLUMNS, task[:4]))
+            decompositions.append(
+                decomposition.rename_axis('date').reset_index().assign(**keys)
+            )
+            forecasts.append(forecast.assign(**keys))
+            models.append({**keys, 'model': model})
+
+    return {
+        'decomposition': pd.concat(decompositions, ignore_index=True),
+        'forecast': pd.concat(forecasts, ignore_index=True),
+        'models': pd.DataFrame(models, columns=KEY_COLUMNS + ['model'])
+    }
+
+
+def save_results(results, directory):
+    os.makedirs(directory, exist_ok=True)
+    for name in RESULT_FRAMES:
+        results[name].to_parquet(os.path.join(directory, f"{name}.parquet"), index=False)
+
+
+def load_results(directory):
+    return {
+        name: pd.read_parquet(os.path.join(directory, f"{name}.parquet"))
+        for name in RESULT_FRAMES
+    }
+
+
+def install_results(results):
+    decompositions = dict(tuple(results['decomposition'].groupby(KEY_COLUMNS)))
+    forecasts = dict(tuple(results['forecast'].groupby(KEY_COLUMNS)))
+
+    entries = {}
+    for row in results['models'].itertuples(index=False):
+        key = (row.region, row.parameter, row.backend, row.series_hash)
+        decomposition = decompositions[key].set_index('date')[
+            ['observed', 'trend', 'seasonal', 'resid']
+        ]
+        actual = decomposition['observed'].rename('y').rename_axis('ds').reset_index()
+        entries[key] = {
+            'model': row.model,
+            'decomposition': decomposition,
+            'forecast': forecasts[key][trend.FORECAST_COLUMNS].reset_index(drop=True),
+            'actual': actual
+        }
+
+    trend.PRECOMPUTED.clear()
+    trend.PRECOMPUTED.update(entries)
+    return len(entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Fit every region x parameter series and save the results.'
+    )
+    parser.add_argument('output', help='directory to write the Parquet results to')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument(
+        '--backend', choices=trend.FORECAST_BACKENDS,
+        default=trend.DEFAULT_FORECAST_BACKEND
+    )
+    args = parser.parse_args()
+
+    results = forecast_all(
+        trend.load_trend_data(), max_workers=args.workers, backend=args.backend
+    )
+    save_results(results, args.output)
+    print(f"Saved {len(results['models'])} forecasts to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from query import HARDCODED_QUESTIONS  # noqa: E402
+
+TREND_SERIES = [
+    {'region': 'Arabian Sea', 'parameter': 'Sea Surface Temperature', 'backend': 'harmonic'},
+    {'region': 'Bay of Bengal', 'parameter': 'Sea Surface Temperature', 'backend': 'harmonic'},
+]
+# name -> (method, path, request bodies cycled through by the clients).
+SCENARIOS = {
+    'health': ('GET', '/health', [None]),
+    'chat': ('POST', '/chat', [{'prompt': q} for q in HARDCODED_QUESTIONS]),
+    'trend': ('POST', '/trend', TREND_SERIES),
+}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(port):
+    env = dict(os.environ, FLOATCHAT_WARMUP='0')
+    server = subprocess.Popen(
+        [sys.executable, str(ROOT / 'api.py'), '--port', str(port)], cwd=ROOT, env=env
+    )
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError('API server exited during startup.')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError('API server did not start within 120 s.')
+
+
+async def request(reader, writer, host, method, path, body):
+    payload = json.dumps(body).encode('utf-8') if body is not None else b''
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n"
+        .encode('latin-1') + payload
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) not in (b'\r\n', b''):
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(host, port, scenario, offset, count, latencies, failures):
+    method, path, bodies = SCENARIOS[scenario]
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(count):
+            body = bodies[(offset + i) % len(bodies)]
+            start = time.perf_counter()
+            status = await request(reader, writer, f"{host}:{port}", method, path, body)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                failures.append(status)
+    finally:
+        writer.close()
+
+
+async def load(host, port, scenario, concurrency, total):
+    latencies, failures = [], []
+    per_client = [total // concurrency + (i < total % concurrency) for i in range(concurrency)]
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, scenario, i, count, latencies, failures)
+        for i, count in enumerate(per_client) if count
+    ))
+    elapsed = time.perf_counter() - start
+    latencies = np.array(latencies) * 1000
+    return {
+        'requests': len(latencies), 'failures': len(failures),
+        'throughput': len(latencies) / elapsed,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Load-test the HTTP API: throughput and p50/p99 latency per concurrency.'
+    )
+    parser.add_argument('--url', help='test a running server instead of starting one')
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS),
+                        default=['chat', 'trend'])
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32, 128])
+    parser.add_argument('--requests', type=int, default=500,
+                        help='requests per scenario and concurrency level')
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        host, port = '127.0.0.1', free_port()
+        server = start_server(port)
+    try:
+        for scenario in args.scenarios:
+            # One untimed pass fills the response and model caches.
+            asyncio.run(load(host, port, scenario, 1, len(SCENARIOS[scenario][2])))
+            for concurrency in args.concurrency:
+                result = asyncio.run(load(host, port, scenario, concurrency, args.requests))
+                print(f"{scenario:<8} c={concurrency:<4} {result['throughput']:9.1f} req/s  "
+                      f"p50 {result['p50_ms']:8.1f} ms  p99 {result['p99_ms']:8.1f} ms  "
+                      f"failures {result['failures']}", flush=True)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
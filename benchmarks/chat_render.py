@@ -0,0 +1,71 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from query import HARDCODED_QUESTIONS, HARDCODED_RESPONSES, get_response  # noqa: E402
+
+PLOT_QUESTIONS = [q for q in HARDCODED_QUESTIONS if HARDCODED_RESPONSES[q]['type'] == 'plot']
+
+
+def render_history(n_messages, from_json):
+    import plotly.io as pio
+    import streamlit as st
+
+    from charts import plotly_chart_from_json
+    from query import HARDCODED_QUESTIONS, HARDCODED_RESPONSES, get_response
+
+    questions = [q for q in HARDCODED_QUESTIONS if HARDCODED_RESPONSES[q]['type'] == 'plot']
+    if 'figures' not in st.session_state:
+        specs = [get_response(questions[i % len(questions)])['plot_json'] for i in range(n_messages)]
+        st.session_state.figures = specs if from_json else [pio.from_json(s) for s in specs]
+    for i, figure in enumerate(st.session_state.figures):
+        with st.chat_message('assistant'):
+            if from_json:
+                plotly_chart_from_json(figure, key=f"plotly_{i}")
+            else:
+                st.plotly_chart(figure, use_container_width=True, key=f"plotly_{i}")
+
+
+def time_reruns(n_messages, from_json, repeats):
+    app = AppTest.from_function(
+        render_history, args=(n_messages, from_json), default_timeout=300
+    )
+    app.run()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        app.run()
+        timings.append(time.perf_counter() - start)
+    assert not app.exception, app.exception
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Time a chat rerun as the number of figure messages grows.'
+    )
+    parser.add_argument('--messages', type=int, nargs='+', default=[1, 10, 50, 200])
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    for question in PLOT_QUESTIONS:
+        get_response(question)
+    for n in args.messages:
+        figure_s = time_reruns(n, False, args.repeats)
+        json_s = time_reruns(n, True, args.repeats)
+        print(
+            f"{n:>5} messages  st.plotly_chart {1000 * figure_s:9.1f} ms/rerun  "
+            f"cached JSON {1000 * json_s:9.1f} ms/rerun"
+        )
+
+
+if __name__ == '__main__':
+    main()
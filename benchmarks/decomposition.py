@@ -0,0 +1,61 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import seasonal  # noqa: E402
+from forecast_backends import synthetic_series  # noqa: E402
+
+
+def bench_statsmodels(values, period):
+    from statsmodels.tsa.seasonal import seasonal_decompose
+
+    start = time.perf_counter()
+    results = [seasonal_decompose(row, model='additive', period=period) for row in values]
+    return time.perf_counter() - start, results
+
+
+def bench_batched(values, period):
+    start = time.perf_counter()
+    result = seasonal.decompose(values, period)
+    return time.perf_counter() - start, result
+
+
+def max_difference(reference, batched):
+    worst = 0.0
+    for i, result in enumerate(reference):
+        for name in ('trend', 'seasonal', 'resid'):
+            expected, actual = getattr(result, name), batched[name][i]
+            if not np.array_equal(np.isnan(expected), np.isnan(actual)):
+                return np.inf
+            worst = max(worst, float(np.nanmax(np.abs(expected - actual))))
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare batched seasonal decomposition with statsmodels.'
+    )
+    parser.add_argument('--series', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--months', type=int, default=120)
+    parser.add_argument('--period', type=int, default=seasonal.PERIOD)
+    args = parser.parse_args()
+
+    for n_series in args.series:
+        values = synthetic_series(n_series, args.months)
+        loop_s, reference = bench_statsmodels(values, args.period)
+        batched_s, batched = bench_batched(values, args.period)
+        print(
+            f"{n_series:>7} series x {args.months} months  "
+            f"statsmodels {1000 * loop_s:10.2f} ms  batched {1000 * batched_s:8.2f} ms  "
+            f"speedup {loop_s / batched_s:7.1f}x  max |diff| {max_difference(reference, batched):.1e}"
+        )
+
+
+if __name__ == '__main__':
+    main()
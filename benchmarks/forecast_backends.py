@@ -0,0 +1,95 @@
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import harmonic  # noqa: E402
+from trend import forecast_series  # noqa: E402
+
+
+def synthetic_series(n_series, n_months, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_months)
+    base = rng.uniform(24, 29, size=(n_series, 1))
+    amplitude = rng.uniform(0.5, 2.5, size=(n_series, 1))
+    phase = rng.uniform(0, 2 * np.pi, size=(n_series, 1))
+    slope = rng.uniform(-0.01, 0.02, size=(n_series, 1))
+    noise = rng.normal(0, 0.2, size=(n_series, n_months))
+    return base + slope * t + amplitude * np.sin(2 * np.pi * t / 12 + phase) + noise
+
+
+def score(actual, yhat, lower, upper):
+    error = yhat - actual
+    return {
+        'mae': float(np.mean(np.abs(error))),
+        'rmse': float(np.sqrt(np.mean(error ** 2))),
+        'coverage': float(np.mean((actual >= lower) & (actual <= upper))),
+    }
+
+
+def bench_harmonic(values, train_months, horizon):
+    start = time.perf_counter()
+    model = harmonic.fit_harmonic(values[:, :train_months])
+    yhat, lower, upper = harmonic.predict_harmonic(
+        model, np.arange(train_months, train_months + horizon)
+    )
+    elapsed = time.perf_counter() - start
+    return elapsed, score(values[:, train_months:], yhat, lower, upper)
+
+
+def bench_prophet(values, dates, train_months, horizon):
+    predictions = []
+    start = time.perf_counter()
+    for row in values:
+        df = pd.DataFrame({'ds': dates[:train_months], 'y': row[:train_months]})
+        _, forecast = forecast_series(df, backend='prophet', periods=horizon)
+        predictions.append(forecast.iloc[-horizon:])
+    elapsed = time.perf_counter() - start
+    return elapsed, score(
+        values[:, train_months:],
+        np.array([p['yhat'] for p in predictions]),
+        np.array([p['yhat_lower'] for p in predictions]),
+        np.array([p['yhat_upper'] for p in predictions]),
+    )
+
+
+def report(name, n_series, elapsed, metrics):
+    print(
+        f"{name:<10} {n_series:>7} series  {elapsed:9.3f}s total  "
+        f"{1000 * elapsed / n_series:9.3f}ms/series  MAE {metrics['mae']:.3f}  "
+        f"RMSE {metrics['rmse']:.3f}  80% coverage {metrics['coverage']:.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare forecasting backends.')
+    parser.add_argument('--series', type=int, nargs='+', default=[10, 1000, 10000])
+    parser.add_argument('--prophet-series', type=int, default=10,
+                        help='Prophet is fitted on at most this many series')
+    parser.add_argument('--months', type=int, default=60)
+    parser.add_argument('--horizon', type=int, default=12)
+    args = parser.parse_args()
+
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+
+    total = args.months + args.horizon
+    dates = pd.date_range('2020-01-01', periods=total, freq='MS')
+    for n_series in args.series:
+        values = synthetic_series(n_series, total)
+        report('harmonic', n_series, *bench_harmonic(values, args.months, args.horizon))
+        n_prophet = min(n_series, args.prophet_series)
+        if n_prophet:
+            report('prophet', n_prophet, *bench_prophet(
+                values[:n_prophet], dates, args.months, args.horizon
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import simplify  # noqa: E402
+from query import create_2d_map, create_3d_globe_plotly  # noqa: E402
+
+
+def random_walk(n, seed=0):
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0, 0.05, size=(n, 2))
+    return pd.DataFrame({
+        'lat': np.clip(10 + np.cumsum(steps[:, 0]), -80, 80),
+        'lon': 65 + np.cumsum(steps[:, 1]),
+    })
+
+
+def build(plot_function, df):
+    start = time.perf_counter()
+    payload = plot_function(df).to_json()
+    return time.perf_counter() - start, len(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare map figure build time and JSON size with and without simplification.'
+    )
+    parser.add_argument('--points', type=int, nargs='+', default=[10**3, 10**4, 10**5, 10**6])
+    parser.add_argument('--budget', type=int, default=simplify.MAX_MAP_POINTS)
+    args = parser.parse_args()
+
+    for n in args.points:
+        df = random_walk(n)
+        for plot_function in (create_2d_map, create_3d_globe_plotly):
+            simplify.MAX_MAP_POINTS = n
+            full_s, full_bytes = build(plot_function, df)
+            simplify.MAX_MAP_POINTS = args.budget
+            lod_s, lod_bytes = build(plot_function, df)
+            print(
+                f"{n:>10,} points  {plot_function.__name__:<22}  "
+                f"full {1000 * full_s:9.1f} ms {full_bytes / 1024:10.1f} KiB  "
+                f"simplified {1000 * lod_s:8.1f} ms {lod_bytes / 1024:8.1f} KiB"
+            )
+
+
+if __name__ == '__main__':
+    main()
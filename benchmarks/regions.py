@@ -0,0 +1,70 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import regions  # noqa: E402
+
+
+def random_fixes(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-60, 30, n), rng.uniform(20, 150, n)
+
+
+def per_row_membership(lat, lon):
+    # The scalar baseline: one Python-level polygon test per fix and basin.
+    def inside(y, x, polygon):
+        result = False
+        x0, y0 = polygon[-1]
+        for x1, y1 in polygon:
+            if (y1 > y) != (y0 > y) and x < x1 + (y - y1) * (x0 - x1) / (y0 - y1):
+                result = not result
+            x0, y0 = x1, y1
+        return result
+
+    polygons = [p.tolist() for p in regions.REGION_POLYGONS.values()]
+    return [[inside(y, x, p) for p in polygons] for y, x in zip(lat, lon)]
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Time basin assignment and region queries over lat/lon fixes.'
+    )
+    parser.add_argument('--points', type=int, nargs='+', default=[10**5, 10**6, 10**7])
+    parser.add_argument('--baseline-points', type=int, default=10**5,
+                        help='the per-row baseline runs on at most this many fixes')
+    args = parser.parse_args()
+
+    regions.region_index()
+    for n in args.points:
+        lat, lon = random_fixes(n)
+        assign_s, _ = timed(regions.region_membership, lat, lon)
+        build_s, index = timed(regions.PointIndex, lat, lon)
+        bbox_s, bbox = timed(index.query_bbox, 60.0, 70.0, -10.0, 5.0)
+        query_s, basin = timed(index.query_region, 'Bay of Bengal')
+
+        print(f"{n:>12,} fixes  membership {1000 * assign_s:9.2f} ms  "
+              f"index build {1000 * build_s:9.2f} ms")
+        print(f"{'':>12}  bbox query {1000 * bbox_s:9.2f} ms ({len(bbox):,})  "
+              f"region query {1000 * query_s:9.2f} ms ({len(basin):,})")
+
+        n_baseline = min(n, args.baseline_points)
+        if n_baseline:
+            baseline_s, _ = timed(per_row_membership, lat[:n_baseline], lon[:n_baseline])
+            print(f"{'':>12}  per-row baseline {1000 * baseline_s * n / n_baseline:9.2f} ms "
+                  f"(extrapolated from {n_baseline:,})")
+
+
+if __name__ == '__main__':
+    main()
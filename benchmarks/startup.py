@@ -0,0 +1,115 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+import tomllib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+MODULES = ['pandas', 'plotly.graph_objects', 'streamlit', 'cache', 'query', 'trend']
+HEAVY_MODULES = ['prophet', 'cmdstanpy', 'statsmodels', 'plotly.express']
+
+# Seconds; a run over budget exits non-zero so CI can flag the regression.
+BUDGET = {
+    'import:query': 1.0,
+    'import:trend': 1.0,
+    'first_render:chat_tab': 3.0,
+}
+
+IMPORT_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+RENDER_PROBE = """
+import json, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({script!r}, default_timeout=120)
+app.run()
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'exceptions': len(app.exception)}}))
+"""
+
+
+def run_probe(source):
+    completed = subprocess.run(
+        [sys.executable, '-c', source], cwd=ROOT, capture_output=True,
+        text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def measure_import(module, repeats):
+    samples = [
+        run_probe(IMPORT_PROBE.format(module=module, heavy=HEAVY_MODULES))
+        for _ in range(repeats)
+    ]
+    return {
+        'seconds': statistics.median(s['seconds'] for s in samples),
+        'heavy': samples[-1]['heavy'],
+    }
+
+
+def measure_first_render(repeats):
+    samples = [
+        run_probe(RENDER_PROBE.format(script=str(ROOT / 'main.py')))
+        for _ in range(repeats)
+    ]
+    return {
+        'seconds': statistics.median(s['seconds'] for s in samples),
+        'exceptions': samples[-1]['exceptions'],
+    }
+
+
+def project_version():
+    with open(ROOT / 'pyproject.toml', 'rb') as f:
+        return tomllib.load(f)['project']['version']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure FloatChat cold-start cost.')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument(
+        '--output', type=Path, default=ROOT / 'benchmarks' / 'results' / 'startup.jsonl'
+    )
+    args = parser.parse_args()
+
+    metrics = {}
+    for module in MODULES:
+        result = measure_import(module, args.repeats)
+        metrics[f'import:{module}'] = result['seconds']
+        heavy = ', '.join(result['heavy']) or '-'
+        print(f"import {module:<22} {result['seconds']:.3f}s  heavy deps loaded: {heavy}")
+
+    render = measure_first_render(args.repeats)
+    metrics['first_render:chat_tab'] = render['seconds']
+    print(f"first render of chat tab   {render['seconds']:.3f}s  exceptions: {render['exceptions']}")
+
+    over_budget = {
+        name: metrics[name] for name, limit in BUDGET.items()
+        if metrics[name] > limit
+    }
+    for name, seconds in over_budget.items():
+        print(f"OVER BUDGET {name}: {seconds:.3f}s > {BUDGET[name]:.3f}s")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'a') as f:
+        f.write(json.dumps({
+            'version': project_version(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': sys.version.split()[0],
+            'metrics': metrics,
+        }) + '\n')
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == '__main__':
+    main()
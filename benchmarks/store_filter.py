@@ -0,0 +1,128 @@
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import store  # noqa: E402
+
+N_REGIONS = 50
+PARAMETERS = ['Sea Surface Temperature', 'Salinity', 'Oxygen', 'Chlorophyll']
+QUERY = {'region': 'Region 07', 'parameter': 'Salinity'}
+
+
+def write_synthetic_store(root, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    per_series = rows // (N_REGIONS * len(PARAMETERS))
+    dates = pd.date_range('2000-01-01', periods=per_series, freq='h')
+    for i in range(N_REGIONS):
+        chunk = pd.DataFrame({
+            'date': np.tile(dates, len(PARAMETERS)),
+            'region': f"Region {i:02d}",
+            'parameter': np.repeat(PARAMETERS, per_series),
+            'value': rng.normal(27, 1.5, per_series * len(PARAMETERS))
+        })
+        store.write_series(chunk, root)
+    return dates
+
+
+def peak_rss_mb():
+    # ru_maxrss survives fork+exec on Linux, so prefer the per-process high-water mark.
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def probe_pandas(root, start, end, repeats):
+    data = store.load_series(root)
+    baseline = peak_rss_mb()
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        data[
+            (data['region'] == QUERY['region']) & (data['parameter'] == QUERY['parameter'])
+            & (data['date'] >= start) & (data['date'] <= end)
+        ]
+        timings.append(time.perf_counter() - t0)
+    return {'seconds': float(np.median(timings)), 'loaded_rss_mb': baseline}
+
+
+def probe_store(root, start, end, repeats):
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        result = store.load_series(root, start=start, end=end, **QUERY)
+        timings.append(time.perf_counter() - t0)
+    return {'seconds': float(np.median(timings)), 'rows': len(result)}
+
+
+def run_probe(method, root, start, end, repeats):
+    completed = subprocess.run(
+        [sys.executable, __file__, '--probe', method, '--root', str(root),
+         '--start', str(start), '--end', str(end), '--repeats', str(repeats)],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare pandas boolean masks with partitioned Parquet pushdown.'
+    )
+    parser.add_argument('--rows', type=int, nargs='+', default=[10**6, 10**7])
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--probe', choices=['pandas', 'store', 'baseline'])
+    parser.add_argument('--root')
+    parser.add_argument('--start')
+    parser.add_argument('--end')
+    args = parser.parse_args()
+
+    if args.probe:
+        start, end = pd.Timestamp(args.start), pd.Timestamp(args.end)
+        if args.probe == 'pandas':
+            result = probe_pandas(args.root, start, end, args.repeats)
+        elif args.probe == 'store':
+            result = probe_store(args.root, start, end, args.repeats)
+        else:
+            result = {'seconds': 0.0}
+        result['peak_rss_mb'] = peak_rss_mb()
+        print(json.dumps(result))
+        return
+
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as root:
+            dates = write_synthetic_store(root, rows)
+            # Query a quarter of one series so both partitions and row groups get pruned.
+            start = dates[len(dates) // 2]
+            end = dates[len(dates) // 2 + len(dates) // 4]
+            baseline = run_probe('baseline', root, start, end, 1)
+            masked = run_probe('pandas', root, start, end, args.repeats)
+            pushed = run_probe('store', root, start, end, args.repeats)
+
+        print(f"{rows:>12,} rows  baseline RSS {baseline['peak_rss_mb']:8.1f} MB")
+        print(
+            f"{'':>12}  pandas mask   {1000 * masked['seconds']:9.2f} ms  "
+            f"peak RSS {masked['peak_rss_mb']:8.1f} MB"
+        )
+        print(
+            f"{'':>12}  store filter  {1000 * pushed['seconds']:9.2f} ms  "
+            f"peak RSS {pushed['peak_rss_mb']:8.1f} MB  ({pushed['rows']:,} rows)"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+import argparse
+import gc
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+# A background warm-up would fill the caches and compete for CPU mid-measurement.
+os.environ['FLOATCHAT_WARMUP'] = '0'
+
+import query  # noqa: E402
+import trend  # noqa: E402
+
+RESULTS_DIR = ROOT / 'benchmarks' / 'results'
+DEFAULT_SIZES = [10**3, 10**4, 10**5, 10**6, 10**7]
+# A metric regresses when it exceeds the baseline by more than this factor.
+THRESHOLDS = {'seconds': 1.5, 'peak_mb': 1.25, 'figure_kb': 1.10}
+
+
+def profile_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    pressure = np.sort(rng.uniform(0, 2000, n))
+    return pd.DataFrame({
+        'pressure': pressure,
+        'temperature': 28 - pressure / 100 + rng.normal(0, 0.3, n),
+        'salinity': 34.5 + pressure / 4000 + rng.normal(0, 0.05, n),
+    })
+
+
+def track_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0, 0.05, size=(n, 2))
+    return pd.DataFrame({
+        'lat': np.clip(10 + np.cumsum(steps[:, 0]), -80, 80),
+        'lon': 65 + np.cumsum(steps[:, 1]),
+    })
+
+
+def monthly_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    return pd.DataFrame({
+        'ds': pd.date_range('1900-01-01', periods=n, freq='MS'),
+        'y': 27 + 1.5 * np.sin(2 * np.pi * t / 12) + rng.normal(0, 0.2, n),
+    })
+
+
+def trend_data(n, months=120, seed=0):
+    rng = np.random.default_rng(seed)
+    n_series = max(1, n // months)
+    dates = pd.date_range('2010-01-01', periods=months, freq='MS')
+    t = np.arange(months)
+    return pd.DataFrame({
+        'date': np.tile(dates, n_series),
+        'region': np.repeat([f"Region {i:05d}" for i in range(n_series)], months),
+        'parameter': 'Sea Surface Temperature',
+        'value': (27 + np.sin(2 * np.pi * t / 12) + rng.normal(0, 0.2, (n_series, months))).ravel(),
+    })
+
+
+def reset_analysis_caches():
+    trend.MODEL_CACHE.clear()
+    trend.LATEST_FITS.clear()
+    trend.PRECOMPUTED.clear()
+
+
+def chat_prompts(_):
+    from streamlit.testing.v1 import AppTest
+
+    query.RESPONSE_CACHE.clear()
+    app = AppTest.from_file(str(ROOT / 'main.py'), default_timeout=600)
+    app.run()
+    for question in query.HARDCODED_QUESTIONS:
+        app.chat_input[0].set_value(question).run()
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+
+
+# name -> (input builder, function under test, largest size worth running).
+# A size of None marks a case that takes no scalable input.
+CASES = {
+    'create_profile_chart': (profile_frame, query.create_profile_chart, None),
+    'create_3d_scatter': (profile_frame, query.create_3d_scatter, None),
+    'create_2d_map': (track_frame, query.create_2d_map, None),
+    'create_3d_globe_plotly': (track_frame, query.create_3d_globe_plotly, None),
+    # Monthly timestamps past ~3000 months overflow pandas' datetime range.
+    'create_timeseries_forecast_chart': (
+        monthly_frame, query.create_timeseries_forecast_chart, 3000
+    ),
+    'get_hardcoded_data': (None, lambda _: trend.get_hardcoded_data(), None),
+    'run_time_series_analysis': (
+        trend_data,
+        lambda data: trend.run_time_series_analysis(
+            data, data['region'].iat[0], 'Sea Surface Temperature'
+        ),
+        None
+    ),
+    # Includes the chat tab's fixed 1.5 s placeholder delay per prompt.
+    'handle_chat_prompt': (None, chat_prompts, None),
+}
+
+
+def figure_size(result):
+    figures = result if isinstance(result, tuple) else (result,)
+    sizes = [len(f.to_json()) for f in figures if hasattr(f, 'to_plotly_json')]
+    return sum(sizes) / 1024 if sizes else None
+
+
+def measure(name, size):
+    build, function, _ = CASES[name]
+    data = build(size) if build else None
+
+    # A small untimed call first, so lazy imports count in neither metric.
+    function(build(min(size, 100)) if build else data)
+
+    reset_analysis_caches()
+    gc.collect()
+    tracemalloc.start()
+    function(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    reset_analysis_caches()
+    gc.collect()
+    start = time.perf_counter()
+    result = function(data)
+    seconds = time.perf_counter() - start
+    return {'seconds': seconds, 'peak_mb': peak / 2**20, 'figure_kb': figure_size(result)}
+
+
+def run_suite(cases, sizes):
+    results = {}
+    for name in cases:
+        build, _, max_size = CASES[name]
+        for size in (sizes if build else [None]):
+            if max_size is not None and size > max_size:
+                continue
+            label = f"{name}[{size if size is not None else '-'}]"
+            results[label] = measure(name, size)
+            metrics = results[label]
+            figure = f"{metrics['figure_kb']:10.1f} KiB" if metrics['figure_kb'] else f"{'-':>14}"
+            print(f"{label:<44} {1000 * metrics['seconds']:10.1f} ms  "
+                  f"{metrics['peak_mb']:9.1f} MB peak  {figure}", flush=True)
+    return results
+
+
+def compare(results, baseline):
+    regressions = []
+    for label, metrics in results.items():
+        previous = baseline.get(label)
+        if previous is None:
+            continue
+        for metric, factor in THRESHOLDS.items():
+            old, new = previous.get(metric), metrics.get(metric)
+            if old and new and new > old * factor:
+                regressions.append((label, metric, old, new))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark chart builders and analysis functions across input sizes.'
+    )
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='row counts, e.g. 1000 10000 100000 1000000 10000000')
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES))
+    parser.add_argument('--baseline', type=Path, default=RESULTS_DIR / 'suite_baseline.json')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='store this run as the baseline instead of comparing to it')
+    parser.add_argument('--output', type=Path, default=RESULTS_DIR / 'suite.jsonl')
+    args = parser.parse_args()
+
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    results = run_suite(args.cases, args.sizes)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'a') as f:
+        f.write(json.dumps({
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': sys.version.split()[0],
+            'results': results,
+        }) + '\n')
+
+    if args.save_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True))
+        print(f"Saved {len(results)} results to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline first.")
+        return
+    regressions = compare(results, json.loads(args.baseline.read_text()))
+    for label, metric, old, new in regressions:
+        print(f"REGRESSION {label} {metric}: {old:.3f} -> {new:.3f} ({new / old:.2f}x)")
+    if not regressions:
+        print('No regressions against the baseline.')
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import trend  # noqa: E402
+from forecast_backends import synthetic_series  # noqa: E402
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare warm-started refits after new months arrive with full refits.'
+    )
+    parser.add_argument('--months', type=int, nargs='+', default=[60, 120, 240, 480])
+    parser.add_argument('--new-months', type=int, default=1)
+    parser.add_argument('--backends', nargs='+', default=trend.FORECAST_BACKENDS,
+                        choices=trend.FORECAST_BACKENDS)
+    args = parser.parse_args()
+
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+
+    for backend in args.backends:
+        for months in args.months:
+            total = months + args.new_months
+            df = pd.DataFrame({
+                'ds': pd.date_range('1980-01-01', periods=total, freq='MS'),
+                'y': synthetic_series(1, total)[0]
+            })
+            previous, _ = trend.forecast_series(df.iloc[:months], backend)
+            full_s, _ = timed(trend.forecast_series, df, backend)
+            warm_s, _ = timed(trend.forecast_series, df, backend, previous=previous)
+            drift, ok = trend.warm_start_drift(df, previous, backend)
+            print(
+                f"{backend:<9} {months:>5}+{args.new_months} months  "
+                f"full refit {1000 * full_s:9.1f} ms  warm start {1000 * warm_s:9.1f} ms  "
+                f"drift {drift:.2e} sd ({'ok' if ok else 'over tolerance'})"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def content_hash(frame):
+    hashed = pd.util.hash_pandas_object(frame, index=True)
+    return hashlib.sha256(hashed.values.tobytes()).hexdigest()
+
+
+def estimate_size(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(estimate_size(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(item) for item in value)
+    return 64
+
+
+class LRUCache:
+    def __init__(self, max_entries=64, disk_dir=None, max_disk_entries=512,
+                 ttl=None, max_bytes=None, spill=False):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        # With spill, entries go to disk only when pushed out of memory rather
+        # than being written through on every put.
+        self.spill = spill
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # key -> [lock, callers waiting on it], so concurrent misses compute once.
+        self._computing = {}
+        if disk_dir and not spill:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        digest = hashlib.sha256(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.disk_dir, f"{digest}.pkl")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            if self.ttl is not None and time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        if self.ttl is None:
+            os.utime(path)
+        return value
+
+    def _write_disk(self, key, value):
+        if not self.disk_dir:
+            return
+        if self.spill:
+            os.makedirs(self.disk_dir, exist_ok=True)
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self._prune_disk()
+
+    def _prune_disk(self):
+        paths = [
+            os.path.join(self.disk_dir, name)
+            for name in os.listdir(self.disk_dir) if name.endswith('.pkl')
+        ]
+        if len(paths) <= self.max_disk_entries:
+            return
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:len(paths) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _expired(self, stored_at):
+        return self.ttl is not None and time.monotonic() - stored_at > self.ttl
+
+    def _evict(self, key):
+        value, _, size = self._entries.pop(key)
+        self.total_bytes -= size
+        self.evictions += 1
+        return value
+
+    def _store(self, key, value):
+        # Returns the (key, value) pairs pushed out of memory.
+        size = estimate_size(value) if self.max_bytes is not None else 0
+        if key in self._entries:
+            self.total_bytes -= self._entries.pop(key)[2]
+        if self.max_bytes is not None and size > self.max_bytes:
+            return [(key, value)]
+        self._entries[key] = (value, time.monotonic(), size)
+        self.total_bytes += size
+        evicted = []
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self.total_bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            evicted.append((oldest, self._evict(oldest)))
+        return evicted
+
+    def _spill(self, evicted):
+        if self.spill:
+            for key, value in evicted:
+                self._write_disk(key, value)
+
+    def get(self, key, default=None):
+        return self._get(key, default, count_miss=True)
+
+    def _get(self, key, default, count_miss):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[1]):
+                self._evict(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += count_miss
+                return default
+            self.hits += 1
+            self.disk_hits += 1
+            evicted = self._store(key, value)
+        self._spill(evicted)
+        return value
+
+    def put(self, key, value):
+        with self._lock:
+            evicted = self._store(key, value)
+        if self.spill:
+            self._spill(evicted)
+        else:
+            self._write_disk(key, value)
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            waiting = self._computing.setdefault(key, [threading.Lock(), 0])
+            waiting[1] += 1
+        try:
+            with waiting[0]:
+                # Another caller may have stored it while this one waited.
+                value = self._get(key, None, count_miss=False)
+                if value is None:
+                    value = compute()
+                    self.put(key, value)
+        finally:
+            with self._lock:
+                waiting[1] -= 1
+                if not waiting[1]:
+                    del self._computing[key]
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,47 @@
+import json
+
+import streamlit as st
+
+try:
+    from streamlit.elements.lib.utils import compute_and_register_element_id
+    from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+except ImportError:
+    compute_and_register_element_id = None
+
+
+SELECTION_MODE = ('points', 'box', 'lasso')
+
+
+def _enqueue_spec(spec, key, config):
+    proto = PlotlyChartProto()
+    proto.use_container_width = True
+    proto.theme = 'streamlit'
+    proto.spec = spec
+    proto.config = json.dumps(config or {})
+    proto.id = compute_and_register_element_id(
+        'plotly_chart',
+        user_key=key,
+        key_as_main_identity=False,
+        dg=st._main,
+        plotly_spec=proto.spec,
+        plotly_config=proto.config,
+        selection_mode=SELECTION_MODE,
+        is_selection_activated=False,
+        theme='streamlit',
+        use_container_width=True,
+    )
+    st._main._enqueue('plotly_chart', proto)
+
+
+def plotly_chart_from_json(spec, key, config=None):
+    # st.plotly_chart rebuilds and re-serializes the figure on every rerun. Chat
+    # figures are serialized once when the answer is built, so send that JSON as-is.
+    # This relies on Streamlit internals; if they change, take the public path.
+    if compute_and_register_element_id is not None:
+        try:
+            return _enqueue_spec(spec, key, config)
+        except (AttributeError, TypeError, ValueError):
+            pass
+    import plotly.io as pio
+
+    st.plotly_chart(pio.from_json(spec), use_container_width=True, key=key, config=config)
@@ -0,0 +1,101 @@
+import atexit
+import io
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+EXPORT_FORMATS = {
+    'csv': ('CSV', 'text/csv', 'csv'),
+    'parquet': ('Parquet', 'application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('Arrow IPC', 'application/vnd.apache.arrow.stream', 'arrows'),
+}
+CHUNK_ROWS = 100_000
+
+# Prepared exports stay on disk, one file per message and format, so a large
+# result is never held in memory next to its dataframe. Past the byte budget the
+# oldest files are deleted and have to be prepared again.
+EXPORT_BYTES = int(os.environ.get('FLOATCHAT_EXPORT_CACHE_MB', 256)) * 1024 * 1024
+EXPORT_DIR = os.path.join(
+    os.environ.get('FLOATCHAT_EXPORT_DIR', tempfile.gettempdir()),
+    f"floatchat-exports-{uuid.uuid4().hex}"
+)
+atexit.register(shutil.rmtree, EXPORT_DIR, ignore_errors=True)
+
+_files = OrderedDict()
+_files_lock = threading.Lock()
+
+
+def iter_chunks(df, chunk_rows=CHUNK_ROWS):
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def write_export(df, export_format, f, chunk_rows=CHUNK_ROWS):
+    # Every format is written chunk by chunk, so the full result is never held
+    # as a second in-memory copy (CSV text, Arrow table) next to the frame.
+    if export_format == 'csv':
+        for i, chunk in enumerate(iter_chunks(df, chunk_rows)):
+            f.write(chunk.to_csv(index=False, header=i == 0).encode('utf-8'))
+        return
+
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    if export_format == 'parquet':
+        writer = pq.ParquetWriter(f, schema)
+    elif export_format == 'arrow':
+        writer = pa.ipc.new_stream(f, schema)
+    else:
+        raise ValueError(f"Unknown export format: {export_format}")
+    with writer:
+        for chunk in iter_chunks(df, chunk_rows):
+            writer.write_table(
+                pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            )
+
+
+def export_bytes(df, export_format):
+    f = io.BytesIO()
+    write_export(df, export_format, f)
+    return f.getvalue()
+
+
+def export_path(key, export_format):
+    with _files_lock:
+        entry = _files.get((key, export_format))
+        if entry is None:
+            return None
+        _files.move_to_end((key, export_format))
+        return entry[0]
+
+
+def prepare_export(key, df, export_format):
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    extension = EXPORT_FORMATS[export_format][2]
+    path = os.path.join(EXPORT_DIR, f"{uuid.uuid4().hex}.{extension}")
+    with open(path, 'wb') as f:
+        write_export(df, export_format, f)
+
+    stale = []
+    with _files_lock:
+        previous = _files.pop((key, export_format), None)
+        if previous is not None:
+            stale.append(previous[0])
+        _files[(key, export_format)] = (path, os.path.getsize(path))
+        total = sum(size for _, size in _files.values())
+        # The file just written is kept even when it alone exceeds the budget.
+        while total > EXPORT_BYTES and len(_files) > 1:
+            _, (old_path, size) = _files.popitem(last=False)
+            stale.append(old_path)
+            total -= size
+    for old_path in stale:
+        try:
+            os.remove(old_path)
+        except OSError:
+            pass
+    return path
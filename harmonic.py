@@ -0,0 +1,125 @@
+import json
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+
+PERIOD = 12
+N_HARMONICS = 3
+# Same default as Prophet's interval_width, so both backends draw comparable bands.
+INTERVAL_WIDTH = 0.8
+
+
+def design_matrix(t, period=PERIOD, n_harmonics=N_HARMONICS):
+    t = np.asarray(t, dtype=float)
+    columns = [np.ones_like(t), t]
+    for k in range(1, n_harmonics + 1):
+        angle = 2 * np.pi * k * t / period
+        columns += [np.sin(angle), np.cos(angle)]
+    return np.column_stack(columns)
+
+
+def month_index(dates):
+    dates = pd.DatetimeIndex(dates)
+    return (dates.year - dates[0].year) * 12 + (dates.month - dates[0].month)
+
+
+def fit_harmonic(values, t=None, period=PERIOD, n_harmonics=N_HARMONICS):
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    n_series, n_obs = values.shape
+    if t is None:
+        t = np.arange(n_obs)
+    X = design_matrix(t, period, n_harmonics)
+    dof = n_obs - X.shape[1]
+    if dof <= 0:
+        raise ValueError(
+            f"Need more than {X.shape[1]} observations to fit {n_harmonics} harmonics, "
+            f"got {n_obs}"
+        )
+
+    xtx = X.T @ X
+    xtx_inv = np.linalg.inv(xtx)
+    xty = values @ X
+    coef = xty @ xtx_inv
+    resid = values - coef @ X.T
+    sigma2 = np.einsum('ij,ij->i', resid, resid) / dof
+
+    # The sufficient statistics (X'X, X'y, y'y) let update_harmonic absorb new
+    # observations without revisiting the history.
+    return {
+        'coef': coef, 'sigma2': sigma2, 'xtx_inv': xtx_inv,
+        'xtx': xtx, 'xty': xty, 'yty': np.einsum('ij,ij->i', values, values),
+        'n_obs': n_obs, 'period': period, 'n_harmonics': n_harmonics,
+        'n_series': n_series
+    }
+
+
+def update_harmonic(model, values, t):
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    X = design_matrix(t, model['period'], model['n_harmonics'])
+    xtx = model['xtx'] + X.T @ X
+    xty = model['xty'] + values @ X
+    yty = model['yty'] + np.einsum('ij,ij->i', values, values)
+    n_obs = model['n_obs'] + values.shape[1]
+
+    xtx_inv = np.linalg.inv(xtx)
+    coef = xty @ xtx_inv
+    sse = (
+        yty - 2 * np.einsum('ij,ij->i', coef, xty)
+        + np.einsum('ij,jk,ik->i', coef, xtx, coef)
+    )
+    return {
+        **model, 'coef': coef, 'sigma2': np.maximum(sse, 0.0) / (n_obs - X.shape[1]),
+        'xtx_inv': xtx_inv, 'xtx': xtx, 'xty': xty, 'yty': yty, 'n_obs': n_obs
+    }
+
+
+def predict_harmonic(model, t, interval_width=INTERVAL_WIDTH):
+    X = design_matrix(t, model['period'], model['n_harmonics'])
+    yhat = model['coef'] @ X.T
+    leverage = np.einsum('ij,jk,ik->i', X, model['xtx_inv'], X)
+    z = NormalDist().inv_cdf(0.5 + interval_width / 2)
+    half_width = z * np.sqrt(np.outer(model['sigma2'], 1 + leverage))
+    return yhat, yhat - half_width, yhat + half_width
+
+
+def can_update(model, n_obs):
+    return model is not None and 'xtx' in model and model['n_obs'] < n_obs
+
+
+def forecast_frame(df, periods=12, previous=None):
+    history = df.dropna(subset=['y'])
+    t = month_index(history['ds'])
+    y = history['y'].to_numpy()
+    if can_update(previous, len(y)):
+        n = previous['n_obs']
+        model = update_harmonic(previous, y[n:], t[n:])
+    else:
+        model = fit_harmonic(y, t=t)
+
+    future_dates = pd.date_range(
+        history['ds'].iloc[-1], periods=periods + 1, freq='MS'
+    )[1:]
+    ds = pd.DatetimeIndex(history['ds']).append(future_dates)
+    yhat, lower, upper = predict_harmonic(model, month_index(ds))
+
+    forecast = pd.DataFrame({
+        'ds': ds, 'yhat': yhat[0], 'yhat_lower': lower[0], 'yhat_upper': upper[0]
+    })
+    return model, forecast
+
+
+def model_to_json(model):
+    return json.dumps({
+        key: value.tolist() if isinstance(value, np.ndarray) else value
+        for key, value in model.items()
+    })
+
+
+def model_from_json(payload):
+    model = json.loads(payload)
+    for key in ('coef', 'sigma2', 'xtx_inv', 'xtx', 'xty', 'yty'):
+        if key in model:
+            model[key] = np.asarray(model[key], dtype=float)
+    return model
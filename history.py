@@ -0,0 +1,92 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+import weakref
+
+from cache import LRUCache
+
+
+HISTORY_WINDOW = int(os.environ.get('FLOATCHAT_HISTORY_WINDOW', 20))
+HISTORY_BYTES = int(os.environ.get('FLOATCHAT_HISTORY_MB', 64)) * 1024 * 1024
+HISTORY_DIR = os.environ.get(
+    'FLOATCHAT_HISTORY_DIR', os.path.join(tempfile.gettempdir(), 'floatchat-history')
+)
+PAYLOAD_FIELDS = ('dataframe', 'plot_json')
+# Spill directories untouched for this long belong to sessions that are gone.
+STALE_SECONDS = 24 * 3600
+
+_pruned = False
+
+
+def prune_stale_spills(max_age=STALE_SECONDS):
+    try:
+        names = os.listdir(HISTORY_DIR)
+    except OSError:
+        return 0
+    removed = 0
+    cutoff = time.time() - max_age
+    for name in names:
+        path = os.path.join(HISTORY_DIR, name)
+        try:
+            stale = os.path.getmtime(path) < cutoff
+        except OSError:
+            continue
+        if stale:
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+class ChatHistory:
+    def __init__(self, window=HISTORY_WINDOW, max_bytes=HISTORY_BYTES, spill_dir=None):
+        self.window = window
+        self.shown = window
+        self.spill_dir = spill_dir or os.path.join(HISTORY_DIR, uuid.uuid4().hex)
+        self.messages = []
+        # Dataframes and figures live apart from the message text. Past the memory
+        # cap the oldest are dropped from memory and read back from disk on demand.
+        self.payloads = LRUCache(
+            max_entries=sys.maxsize, disk_dir=self.spill_dir,
+            max_disk_entries=sys.maxsize, max_bytes=max_bytes, spill=True
+        )
+        # The directory is only created on the first spill; remove it with the
+        # session, and sweep what crashed processes left behind once per process.
+        weakref.finalize(self, shutil.rmtree, self.spill_dir, ignore_errors=True)
+        global _pruned
+        if not _pruned:
+            _pruned = True
+            prune_stale_spills()
+
+    def append(self, message):
+        payload = {field: message.pop(field) for field in PAYLOAD_FIELDS if field in message}
+        if payload:
+            self.payloads.put(message['id'], payload)
+            message['payload'] = sorted(payload)
+        self.messages.append(message)
+
+    def payload(self, message):
+        if not message.get('payload'):
+            return {}
+        return self.payloads.get(message['id'], {})
+
+    def visible(self):
+        start = max(0, len(self.messages) - self.shown)
+        return list(enumerate(self.messages[start:], start))
+
+    def hidden(self):
+        return max(0, len(self.messages) - self.shown)
+
+    def show_earlier(self):
+        self.shown += self.window
+
+    def clear(self):
+        self.messages = []
+        self.shown = self.window
+        self.payloads.clear()
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def __len__(self):
+        return len(self.messages)
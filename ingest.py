@@ -0,0 +1,245 @@
+import argparse
+import json
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import store
+from rollup import load_rollup, rebuild as rebuild_rollup
+from trajectory import load_trajectories, rebuild as rebuild_trajectories
+
+
+MANIFEST_NAME = 'ingest_manifest.jsonl'
+ARGO_EPOCH = pd.Timestamp('1950-01-01')
+FILL_THRESHOLD = 99999.0
+MEASUREMENTS = {'pressure': 'PRES', 'temperature': 'TEMP', 'salinity': 'PSAL'}
+
+
+def find_profile_files(source):
+    for dirpath, dirnames, filenames in os.walk(source):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.endswith('.nc'):
+                yield os.path.join(dirpath, name)
+
+
+def _variable(nc, name):
+    if name not in nc.variables:
+        return None
+    values = np.array(nc.variables[name].data, dtype=float)
+    values[values >= FILL_THRESHOLD] = np.nan
+    return values
+
+
+def _strings(nc, name, n_prof):
+    if name not in nc.variables:
+        return np.array([''] * n_prof)
+    raw = np.asarray(nc.variables[name].data)
+    if raw.ndim == 1:
+        return np.array([v.decode('ascii', 'ignore').strip() for v in raw])
+    return np.array([
+        b''.join(row).decode('ascii', 'ignore').strip() for row in raw
+    ])
+
+
+def read_profile_file(path):
+    from scipy.io import netcdf_file
+
+    with netcdf_file(path, 'r', mmap=False, maskandscale=False) as nc:
+        n_prof, n_levels = nc.variables['PRES'].data.shape
+        data_mode = _strings(nc, 'DATA_MODE', n_prof)
+        # Delayed-mode and adjusted profiles carry their corrected values in *_ADJUSTED.
+        adjusted_mode = np.isin(
+            np.array([m[:1] for m in data_mode]), ['A', 'D']
+        )[:, None]
+
+        columns = {}
+        for column, name in MEASUREMENTS.items():
+            raw = _variable(nc, name)
+            adjusted = _variable(nc, f"{name}_ADJUSTED")
+            if raw is None:
+                raw = np.full((n_prof, n_levels), np.nan)
+            if adjusted is not None:
+                raw = np.where(adjusted_mode & ~np.isnan(adjusted), adjusted, raw)
+            columns[column] = raw.ravel()
+
+        platform = _strings(nc, 'PLATFORM_NUMBER', n_prof)
+        cycle = np.asarray(nc.variables['CYCLE_NUMBER'].data, dtype=np.int32)
+        juld = _variable(nc, 'JULD')
+        lat = _variable(nc, 'LATITUDE')
+        lon = _variable(nc, 'LONGITUDE')
+
+    dates = ARGO_EPOCH + pd.to_timedelta(juld, unit='D')
+    frame = pd.DataFrame({
+        'float': np.repeat(pd.to_numeric(platform, errors='coerce'), n_levels),
+        'cycle': np.repeat(cycle, n_levels),
+        'date': np.repeat(dates.values, n_levels),
+        'lat': np.repeat(lat, n_levels),
+        'lon': np.repeat(lon, n_levels),
+        **columns
+    })
+    frame = frame.dropna(subset=['float', 'date', 'lat', 'lon', 'pressure'])
+    return frame.astype({'float': 'int64'})[store.PROFILE_COLUMNS]
+
+
+def read_manifest(root):
+    # Returns the files of committed batches and the ids of batches that were
+    # started but never committed. Lines without a batch id predate batch ids.
+    path = os.path.join(root, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return set(), []
+    files, started, committed, closed = {}, [], set(), set()
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A torn last line from an interrupted append.
+                continue
+            if 'file' in entry:
+                files[entry['file']] = entry.get('batch')
+            elif entry.get('state') == 'started':
+                started.append(entry['batch'])
+            elif entry.get('state') in ('committed', 'rolled_back'):
+                closed.add(entry['batch'])
+                if entry['state'] == 'committed':
+                    committed.add(entry['batch'])
+    done = {path for path, batch in files.items() if batch is None or batch in committed}
+    return done, [batch for batch in started if batch not in closed]
+
+
+def _append_lines(root, entries):
+    with open(os.path.join(root, MANIFEST_NAME), 'a') as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def start_batch(root, batch_id):
+    _append_lines(root, [{'batch': batch_id, 'state': 'started'}])
+
+
+def commit_batch(root, batch_id, files):
+    _append_lines(root, [
+        *({'file': path, 'rows': rows, 'batch': batch_id} for path, rows in files),
+        {'batch': batch_id, 'state': 'committed'}
+    ])
+
+
+def recover_batches(root):
+    # Rows of a batch that never committed are removed, so its files are read
+    # again from scratch instead of being appended a second time.
+    done, uncommitted = read_manifest(root)
+    for batch_id in uncommitted:
+        store.remove_profile_batch(root, batch_id)
+        _append_lines(root, [{'batch': batch_id, 'state': 'rolled_back'}])
+    return uncommitted
+
+
+def _read_task(path):
+    try:
+        return path, read_profile_file(path), None
+    except Exception as exc:
+        return path, None, f"{type(exc).__name__}: {exc}"
+
+
+def read_files(paths, workers):
+    if workers <= 1:
+        for path in paths:
+            yield _read_task(path)
+        return
+
+    # Keep only a bounded number of parsed files in flight so memory stays flat.
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        pending = []
+        for path in paths:
+            pending.append(pool.submit(_read_task, path))
+            if len(pending) >= workers * 2:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def ingest_directory(source, root, workers=1, batch_rows=500_000, on_batch=()):
+    os.makedirs(root, exist_ok=True)
+    recover_batches(root)
+    done, _ = read_manifest(root)
+    paths = (
+        path for path in find_profile_files(source)
+        if os.path.relpath(path, source) not in done
+    )
+
+    buffered, buffered_files, buffered_rows = [], [], 0
+    summary = {'files': 0, 'rows': 0, 'errors': []}
+
+    def flush():
+        nonlocal buffered, buffered_files, buffered_rows
+        if buffered_files:
+            batch_id = uuid.uuid4().hex
+            start_batch(root, batch_id)
+            if buffered:
+                batch = pd.concat(buffered, ignore_index=True)
+                store.write_profiles(batch, root, batch_id)
+                for callback in on_batch:
+                    callback(batch)
+            commit_batch(root, batch_id, buffered_files)
+        summary['files'] += len(buffered_files)
+        summary['rows'] += buffered_rows
+        buffered, buffered_files, buffered_rows = [], [], 0
+
+    for path, frame, error in read_files(paths, workers):
+        relative = os.path.relpath(path, source)
+        if error is not None:
+            summary['errors'].append((relative, error))
+            continue
+        if len(frame):
+            buffered.append(frame)
+        buffered_files.append((relative, len(frame)))
+        buffered_rows += len(frame)
+        if buffered_rows >= batch_rows:
+            flush()
+    flush()
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Ingest Argo profile NetCDF files into the local columnar store.'
+    )
+    parser.add_argument('source', help='directory searched recursively for *.nc files')
+    parser.add_argument('store', help='store root (same as FLOATCHAT_STORE_DIR)')
+    parser.add_argument('--workers', type=int, default=os.process_cpu_count() or 1)
+    parser.add_argument('--batch-rows', type=int, default=500_000)
+    args = parser.parse_args()
+
+    # A batch that never committed may already be counted in the rollup. Its rows
+    # are removed, so rebuild the derived files from what is actually stored.
+    if recover_batches(args.store) and store.has_dataset(args.store, store.PROFILES_DATASET):
+        rebuild_rollup(args.store)
+        rebuild_trajectories(args.store)
+    rollup = load_rollup(args.store)
+    trajectories = load_trajectories(args.store)
+
+    def update_rollup(batch):
+        rollup.update(batch).save(args.store)
+
+    def update_trajectories(batch):
+        trajectories.update(batch).save(args.store)
+
+    summary = ingest_directory(
+        args.source, args.store, workers=args.workers, batch_rows=args.batch_rows,
+        on_batch=[update_rollup, update_trajectories]
+    )
+    print(f"Ingested {summary['rows']:,} measurements from {summary['files']} files")
+    for path, error in summary['errors']:
+        print(f"Skipped {path}: {error}")
+
+
+if __name__ == '__main__':
+    main()
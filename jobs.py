@@ -0,0 +1,89 @@
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import trend
+
+
+MAX_JOBS = 64
+
+EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('FLOATCHAT_ANALYSIS_WORKERS', 2)),
+    thread_name_prefix='floatchat-analysis'
+)
+
+_jobs = OrderedDict()
+_in_flight = {}
+_lock = threading.Lock()
+
+
+class AnalysisJob:
+    def __init__(self, job_id, key, decomposition, forecast):
+        self.job_id = job_id
+        self.key = key
+        self.region, self.parameter, self.backend = key[:3]
+        self.decomposition = decomposition
+        self.forecast = forecast
+
+    def done(self):
+        return self.decomposition.done() and self.forecast.done()
+
+
+def _run_decomposition(series, key, cached):
+    parameter = key[1]
+    decomposition = cached['decomposition'] if cached else trend.decompose_series(series)
+    return decomposition, trend.plot_decomposition(decomposition, parameter)
+
+
+def _run_forecast(series, key, cached, decomposition_future):
+    parameter = key[1]
+    try:
+        if cached:
+            result = cached
+        else:
+            actual = trend.to_prophet_frame(series)
+            model, forecast = trend.forecast_incremental(series, key)
+            decomposition, _ = decomposition_future.result()
+            result = {
+                'model': model, 'decomposition': decomposition,
+                'forecast': forecast, 'actual': actual
+            }
+            trend.MODEL_CACHE.put(key, result)
+    finally:
+        with _lock:
+            _in_flight.pop(key, None)
+    return trend.plot_forecast(result['forecast'], result['actual'], parameter)
+
+
+def _prune_jobs():
+    # Only finished jobs are dropped; a session may still be polling a running one.
+    finished = (job_id for job_id, job in _jobs.items() if job.done())
+    for job_id in list(finished)[:max(0, len(_jobs) - MAX_JOBS)]:
+        del _jobs[job_id]
+
+
+def submit_analysis(data, region, parameter, backend=None):
+    series = trend.select_series(data, region, parameter)
+    key = trend.analysis_key(series, region, parameter, backend)
+
+    with _lock:
+        job_id = _in_flight.get(key)
+        if job_id in _jobs:
+            return job_id
+
+        cached = trend.cached_analysis(key)
+        decomposition = EXECUTOR.submit(_run_decomposition, series, key, cached)
+        forecast = EXECUTOR.submit(_run_forecast, series, key, cached, decomposition)
+
+        job_id = uuid.uuid4().hex
+        _jobs[job_id] = AnalysisJob(job_id, key, decomposition, forecast)
+        _in_flight[key] = job_id
+        _prune_jobs()
+    return job_id
+
+
+def get_job(job_id):
+    with _lock:
+        return _jobs.get(job_id)
@@ -0,0 +1,95 @@
+import numpy as np
+
+
+# Standard pressure levels in dbar (roughly metres of depth).
+STANDARD_LEVELS = np.array(
+    [5, 10, 20, 50, 100, 150, 200, 300, 500, 1000, 1500, 2000], dtype=float
+)
+VARIABLES = ['temperature', 'salinity']
+PROFILE_KEY = ['float', 'cycle']
+
+
+def level_tolerance(levels):
+    return np.maximum(2.5, 0.05 * levels)
+
+
+def interpolation_gap(levels):
+    return np.maximum(20.0, 0.25 * levels)
+
+
+def profile_codes(frame, by):
+    if not by:
+        return np.zeros(len(frame), dtype=np.int64)
+    return frame.groupby(list(by), sort=False).ngroup().to_numpy(dtype=np.int64)
+
+
+def profile_levels(frame, by=PROFILE_KEY, carry=(), variables=VARIABLES,
+                   levels=STANDARD_LEVELS):
+    levels = np.asarray(levels, dtype=float)
+    codes = profile_codes(frame, by)
+    n_profiles = int(codes.max()) + 1 if len(codes) else 0
+    first_rows = np.unique(codes, return_index=True)[1]
+    profiles = frame.iloc[first_rows][list(by) + list(carry)].reset_index(drop=True)
+    if not n_profiles:
+        return profiles, {v: np.empty((0, len(levels))) for v in variables}
+
+    pressure = frame['pressure'].to_numpy(dtype=float)
+    measured = ~np.isnan(pressure)
+    order = np.lexsort((pressure, codes))
+    order = order[measured[order]]
+    pressure, codes = pressure[order], codes[order]
+
+    # Each profile gets its own stretch of one sorted key axis, so a single
+    # searchsorted finds the samples bracketing every (profile, level) pair.
+    floor = min(pressure.min(), levels.min()) if len(pressure) else levels.min()
+    span = max(pressure.max() if len(pressure) else 0, levels.max()) - floor + 1
+    profile = np.arange(n_profiles)[:, None]
+    target = profile * span + (levels - floor)
+    tolerance, gap = level_tolerance(levels), interpolation_gap(levels)
+
+    result = {}
+    for variable in variables:
+        values = frame[variable].to_numpy(dtype=float)[order]
+        keep = ~np.isnan(values)
+        p, v, c = pressure[keep], values[keep], codes[keep]
+        if not len(p):
+            result[variable] = np.full((n_profiles, len(levels)), np.nan)
+            continue
+        key = c * span + (p - floor)
+
+        upper = np.searchsorted(key, target, side='left')
+        lower = upper - 1
+        upper_c, lower_c = np.minimum(upper, len(p) - 1), np.maximum(lower, 0)
+        has_upper = (upper < len(p)) & (c[upper_c] == profile)
+        has_lower = (lower >= 0) & (c[lower_c] == profile)
+        p_upper, p_lower = p[upper_c], p[lower_c]
+        v_upper, v_lower = v[upper_c], v[lower_c]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight = np.where(
+                p_upper > p_lower, (levels - p_lower) / (p_upper - p_lower), 0.0
+            )
+        bracketed = has_upper & has_lower & (p_upper - p_lower <= gap)
+        interpolated = np.where(bracketed, v_lower + weight * (v_upper - v_lower), np.nan)
+
+        # Just outside the sampled range, or across a wide gap, fall back to the
+        # closest sample when it lies within the level's tolerance.
+        d_upper = np.where(has_upper, p_upper - levels, np.inf)
+        d_lower = np.where(has_lower, levels - p_lower, np.inf)
+        nearest = np.where(d_upper <= d_lower, v_upper, v_lower)
+        close = np.minimum(d_upper, d_lower) <= tolerance
+        result[variable] = np.where(
+            np.isnan(interpolated) & close, nearest, interpolated
+        )
+    return profiles, result
+
+
+def levels_frame(frame, by=PROFILE_KEY, carry=(), variables=VARIABLES,
+                 levels=STANDARD_LEVELS):
+    profiles, values = profile_levels(frame, by, carry, variables, levels)
+    levels = np.asarray(levels, dtype=float)
+    long = profiles.loc[profiles.index.repeat(len(levels))].reset_index(drop=True)
+    long['level'] = np.tile(levels, len(profiles))
+    for variable in variables:
+        long[variable] = values[variable].ravel()
+    return long.dropna(subset=list(variables), how='all').reset_index(drop=True)
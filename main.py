@@ -1,13 +1,31 @@
 import streamlit as st
+import os
 import time
+import uuid
 import pandas as pd
+from charts import plotly_chart_from_json
+from exports import EXPORT_FORMATS, export_path, prepare_export
+from history import ChatHistory
 from query import (
     HARDCODED_QUESTIONS,
     HARDCODED_RESPONSES,
     HARDCODED_XAI,
-    DEFAULT_XAI_DETAILS
+    DEFAULT_XAI_DETAILS,
+    average_ocean_temperature_label,
+    get_response,
+    resolve_prompt
 )
-from trend import get_hardcoded_data, run_time_series_analysis
+from trend import (
+    DEFAULT_FORECAST_BACKEND,
+    FORECAST_BACKENDS,
+    MODEL_CACHE,
+    load_trend_data,
+    series_catalog
+)
+from jobs import get_job, submit_analysis
+from anomaly import scan_events
+from warmup import WARMUP_ENABLED, start_warmup
+from profiling import PROFILE_LOG, start_profiler
 
 st.set_page_config(
     page_title="FloatChat - The Thinking Ocean",
@@ -509,202 +527,381 @@ def apply_theme():
         <div class="wave-overlay"></div>
     """, unsafe_allow_html=True)
 
-if "messages" not in st.session_state:
-    st.session_state.messages = []
+FORECAST_BACKEND_LABELS = {
+    'prophet': "Prophet (ML)",
+    'harmonic': "Harmonic regression (fast)"
+}
+
+@st.cache_resource
+def load_precomputed_forecasts():
+    directory = os.environ.get('FLOATCHAT_PRECOMPUTED_DIR')
+    if not directory or not os.path.isdir(directory):
+        return 0
+    from batch import install_results, load_results
+    return install_results(load_results(directory))
 
 def handle_chat_prompt(prompt):
-    st.session_state.messages.append({"role": "user", "content": prompt})
+    st.session_state.history.append(
+        {"id": uuid.uuid4().hex, "role": "user", "content": prompt}
+    )
+    response_key = resolve_prompt(prompt)
     
     assistant_message = {
+        "id": uuid.uuid4().hex,
         "role": "assistant",
         "content": (
             f"You asked: '{prompt}'. I'm currently processing this. "
             "(Assistant placeholder response)"
         ),
-        "xai_details": HARDCODED_XAI.get(prompt, DEFAULT_XAI_DETAILS)
+        "response_key": response_key,
+        "xai_details": HARDCODED_XAI.get(response_key, DEFAULT_XAI_DETAILS)
     }
 
-    response_obj = HARDCODED_RESPONSES.get(prompt)
-
     with st.spinner("🌊 Diving into the ocean depths of data..."):
         time.sleep(1.5) 
         
-        if response_obj:
-            response_type = response_obj["type"]
-            assistant_message["content"] = response_obj.get(
-                "text_summary", response_obj.get("data", "")
-            )
+        if response_key is not None:
+            response = get_response(response_key)
+            assistant_message["content"] = response["content"]
 
-            if "dataframe" in response_obj:
-                assistant_message["dataframe"] = response_obj["dataframe"]
+            if "dataframe" in response:
+                assistant_message["dataframe"] = response["dataframe"]
 
-            if response_type == "plot":
-                plot_function = response_obj["plot_function"]
-                assistant_message["plot_fig"] = plot_function(
-                    response_obj["dataframe"]
-                )
+            if "plot_json" in response:
+                assistant_message["plot_json"] = response["plot_json"]
+
+    st.session_state.history.append(assistant_message)
 
-    st.session_state.messages.append(assistant_message)
 
+def render_export(message, i):
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        export_format = st.selectbox(
+            "Export format", options=list(EXPORT_FORMATS),
+            format_func=lambda f: EXPORT_FORMATS[f][0],
+            key=f"export_format_{message['id']}", label_visibility="collapsed"
+        )
+    label, mime, extension = EXPORT_FORMATS[export_format]
+    # Exports are only built on request and kept on disk per message and format.
+    path = export_path(message["id"], export_format)
+    with col2:
+        if path is not None:
+            try:
+                with open(path, "rb") as f:
+                    st.download_button(
+                        label=f"⬇️ Download {label}",
+                        data=f,
+                        file_name=f"ocean_data_{i}.{extension}",
+                        mime=mime,
+                        key=f"download_{message['id']}_{export_format}"
+                    )
+                return
+            except FileNotFoundError:
+                pass
+        st.button(
+            f"📦 Prepare {label}", key=f"prepare_{message['id']}_{export_format}",
+            on_click=prepare_export,
+            args=(message["id"], message["dataframe"], export_format)
+        )
 
-apply_theme()
 
-st.markdown(
-    '''<div style="text-align: center; margin-bottom: 3rem;">
+def render_analysis_result(future, render):
+    if not future.done():
+        st.info("🌊 Analyzing oceanic patterns...")
+    elif future.exception() is not None:
+        st.error(f"Analysis failed: {future.exception()}")
+    else:
+        render(future.result())
+
+
+def render_analysis(job):
+    st.caption(
+        f"📍 {job.region} · {job.parameter} · "
+        f"{FORECAST_BACKEND_LABELS.get(job.backend, job.backend)}"
+    )
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("#### 🔄 Seasonal Decomposition")
+        st.caption("Revealing hidden patterns in ocean data")
+        render_analysis_result(
+            job.decomposition,
+            lambda result: st.plotly_chart(result[1], use_container_width=True)
+        )
+
+    with col2:
+        st.markdown("#### 🔮 12-Month Forecast")
+        st.caption(
+            f"Predictions using {FORECAST_BACKEND_LABELS.get(job.backend, job.backend)}"
+        )
+        render_analysis_result(
+            job.forecast,
+            lambda fig: st.plotly_chart(fig, use_container_width=True)
+        )
+
+    cache_stats = MODEL_CACHE.stats()
+    st.caption(
+        f"🗄️ Model cache: {cache_stats['hits']} hits "
+        f"({cache_stats['disk_hits']} from disk) / "
+        f"{cache_stats['misses']} misses"
+    )
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def scan_heatwaves(percentile, min_duration):
+    return scan_events(load_trend_data(), percentile / 100, min_duration)
+
+
+def render_profile(report):
+    st.divider()
+    st.markdown('<h3 class="sidebar-title">Rerun Profile</h3>', unsafe_allow_html=True)
+    st.caption(f"⏱️ {1000 * report['total']:.0f} ms this rerun · log: {PROFILE_LOG}")
+    phases = pd.DataFrame(report["phases"])
+    phases["ms"] = (1000 * phases.pop("seconds")).round(1)
+    st.dataframe(phases, hide_index=True, use_container_width=True)
+    if report["hotspots"] is None:
+        st.caption("Hotspots unavailable: another rerun was being profiled.")
+        return
+    with st.expander("🔥 Hotspots"):
+        hotspots = pd.DataFrame(report["hotspots"])
+        for column in ("tottime", "cumtime"):
+            hotspots[column] = (1000 * hotspots[column]).round(2)
+        st.dataframe(
+            hotspots.rename(columns={"tottime": "own ms", "cumtime": "cumulative ms"}),
+            hide_index=True, use_container_width=True
+        )
+
+
+def render_warmup_status(status):
+    if status['state'] == 'ready':
+        st.caption(f"⚡ Quick answers ready (warmed in {status['seconds']:.0f}s)")
+    else:
+        st.caption(f"⚡ Warming up quick answers {status['done']}/{status['total'] or '…'}")
+
+
+@st.fragment(run_every=2)
+def poll_warmup():
+    render_warmup_status(warmup.status())
+    if warmup.ready():
+        st.rerun()
+
+
+@st.fragment(run_every=1)
+def poll_analysis(job_id):
+    job = get_job(job_id)
+    if job is None:
+        # Leave the fragment so it stops polling; the page reports the lost job.
+        st.rerun()
+    render_analysis(job)
+    if job.done():
+        st.rerun()
+
+
+# A rerun stopped early (st.rerun, st.stop or an exception) still releases
+# the profiler, so the next profiled rerun in any session can take it.
+profiler = start_profiler(st.query_params.get("profile"))
+try:
+    profiler.phase("setup")
+    load_precomputed_forecasts()
+    warmup = start_warmup()
+
+    if "history" not in st.session_state:
+        st.session_state.history = ChatHistory()
+
+    profiler.phase("theme")
+    apply_theme()
+
+    st.markdown(
+        '''<div style="text-align: center; margin-bottom: 3rem;">
         <h1 class="floatchat-title">FloatChat</h1>
         <p class="floatchat-subtitle">Where Data Meets the Deep</p>
     </div>''', 
-    unsafe_allow_html=True
-)
+        unsafe_allow_html=True
+    )
 
-with st.sidebar:
-    st.markdown('<h3 class="sidebar-title">Ocean Pulse</h3>', unsafe_allow_html=True)
+    profiler.phase("sidebar")
+    with st.sidebar:
+        st.markdown('<h3 class="sidebar-title">Ocean Pulse</h3>', unsafe_allow_html=True)
 
-    st.markdown(
-        '''<div class="metric-card">
+        st.markdown(
+            '''<div class="metric-card">
             <div class="metric-card-value">3,847</div>
             <div class="metric-card-label">Active Floats</div>
         </div>''', 
-        unsafe_allow_html=True
-    )
+            unsafe_allow_html=True
+        )
     
-    st.markdown(
-        '''<div class="metric-card">
+        st.markdown(
+            '''<div class="metric-card">
             <div class="metric-card-value">152</div>
             <div class="metric-card-label">New Profiles</div>
         </div>''', 
-        unsafe_allow_html=True
-    )
+            unsafe_allow_html=True
+        )
     
-    st.markdown(
-        '''<div class="metric-card">
-            <div class="metric-card-value">28.1°C</div>
+        st.markdown(
+            f'''<div class="metric-card">
+            <div class="metric-card-value">{average_ocean_temperature_label()}</div>
             <div class="metric-card-label">Avg Ocean Temp</div>
         </div>''', 
-        unsafe_allow_html=True
-    )
+            unsafe_allow_html=True
+        )
     
-    st.markdown(
-        '<p class="timestamp-label">🕐 Last sync: 28 Sep 2025 14:30 UTC</p>', 
-        unsafe_allow_html=True
-    )
+        st.markdown(
+            '<p class="timestamp-label">🕐 Last sync: 28 Sep 2025 14:30 UTC</p>', 
+            unsafe_allow_html=True
+        )
+
+        if WARMUP_ENABLED:
+            if warmup.ready():
+                render_warmup_status(warmup.status())
+            else:
+                poll_warmup()
     
-    st.divider()
+        st.divider()
     
-    st.markdown('<h3 class="sidebar-title">Command Bridge</h3>', unsafe_allow_html=True)
+        st.markdown('<h3 class="sidebar-title">Command Bridge</h3>', unsafe_allow_html=True)
     
-    if st.button("🔄 Clear", help="Reset conversation", use_container_width=True):
-        st.session_state.messages = []
-        st.rerun()
+        if st.button("🔄 Clear", help="Reset conversation", use_container_width=True):
+            st.session_state.history.clear()
+            st.rerun()
     
-    st.divider()
+        st.divider()
     
-    st.markdown('<h3 class="sidebar-title">Quick Queries</h3>', unsafe_allow_html=True)
+        st.markdown('<h3 class="sidebar-title">Quick Queries</h3>', unsafe_allow_html=True)
     
-    def set_selected_question(question):
-        st.session_state.selected_question = question
+        def set_selected_question(question):
+            st.session_state.selected_question = question
 
-    for i, question in enumerate(HARDCODED_QUESTIONS):
-        display_text = (question[:65] + '...') if len(question) > 65 else question
-        st.button(
-            f"🌊 {display_text}",
-            key=f"hardcoded_q_{i}",
-            on_click=set_selected_question,
-            args=(question,),
-            use_container_width=True
-        )
+        for i, question in enumerate(HARDCODED_QUESTIONS):
+            display_text = (question[:65] + '...') if len(question) > 65 else question
+            st.button(
+                f"🌊 {display_text}",
+                key=f"hardcoded_q_{i}",
+                on_click=set_selected_question,
+                args=(question,),
+                use_container_width=True
+            )
 
-tab1, tab2 = st.tabs(["**Ocean Assistant**", "**Trend Analysis**"])
+    tab1, tab2 = st.tabs(["**Ocean Assistant**", "**Trend Analysis**"])
 
-with tab1:
-    if "selected_question" in st.session_state:
-        prompt = st.session_state.selected_question
-        del st.session_state.selected_question
-        handle_chat_prompt(prompt)
-        st.rerun()
+    profiler.phase("chat")
+    with tab1:
+        if "selected_question" in st.session_state:
+            prompt = st.session_state.selected_question
+            del st.session_state.selected_question
+            handle_chat_prompt(prompt)
+            st.rerun()
 
-    # Chat Messages with Enhanced Styling
-    for i, message in enumerate(st.session_state.messages):
-        with st.chat_message(message["role"]):
-            is_assistant = message["role"] == "assistant"
-            question_key = st.session_state.messages[i-1].get("content") if i > 0 else None
-            response_obj = HARDCODED_RESPONSES.get(question_key)
-            is_table = (
-                is_assistant and response_obj and
-                response_obj["type"] == "table"
+        history = st.session_state.history
+        if history.hidden():
+            st.button(
+                f"⬆️ Show earlier messages ({history.hidden()} hidden)",
+                on_click=history.show_earlier, use_container_width=True
             )
 
-            if is_table:
-                st.markdown(message["content"])
-                st.dataframe(message["dataframe"], use_container_width=True)
-            else:
-                st.markdown(message["content"])
-
-            if "plot_fig" in message:
-                st.plotly_chart(
-                    message["plot_fig"], use_container_width=True,
-                    key=f"plotly_{i}"
-                )
-            
-            if "dataframe" in message:
-                csv = message["dataframe"].to_csv(index=False).encode('utf-8')
-                st.download_button(
-                    label="⬇️ Download CSV",
-                    data=csv,
-                    file_name=f"ocean_data_{i}.csv",
-                    mime="text/csv",
-                    key=f"download_{i}"
+        # Chat Messages with Enhanced Styling
+        for i, message in history.visible():
+            message = {**message, **history.payload(message)}
+            with st.chat_message(message["role"]):
+                is_assistant = message["role"] == "assistant"
+                response_obj = HARDCODED_RESPONSES.get(message.get("response_key"))
+                is_table = (
+                    is_assistant and response_obj and
+                    response_obj["type"] == "table"
                 )
 
-            if is_assistant:
-                with st.expander("🧠 Thought Process"):
-                    st.markdown(
-                        message["xai_details"], unsafe_allow_html=True
+                if is_table:
+                    st.markdown(message["content"])
+                    st.dataframe(message["dataframe"], use_container_width=True)
+                else:
+                    st.markdown(message["content"])
+
+                if "plot_json" in message:
+                    plotly_chart_from_json(
+                        message["plot_json"], key=f"plotly_{message['id']}"
                     )
+            
+                if "dataframe" in message:
+                    render_export(message, i)
 
-    # Premium Chat Input
-    if user_input := st.chat_input("🌊 Ask about the ocean's secrets..."):
-        handle_chat_prompt(user_input)
-        st.rerun()
+                if is_assistant:
+                    with st.expander("🧠 Thought Process"):
+                        st.markdown(
+                            message["xai_details"], unsafe_allow_html=True
+                        )
 
-with tab2:
-    st.markdown("### 📊 Deep Ocean Trend Analysis")
-    st.info(
-        "🌊 Explore temporal patterns in ocean data using advanced time-series analysis "
-        "and machine learning forecasting models."
-    )
-    
-    historical_data = get_hardcoded_data()
+        # Premium Chat Input
+        if user_input := st.chat_input("🌊 Ask about the ocean's secrets..."):
+            handle_chat_prompt(user_input)
+            st.rerun()
 
-    col1, col2, col3 = st.columns([2, 2, 1])
-    with col1:
-        selected_region = st.selectbox(
-            "🗺️ Ocean Region:", 
-            options=historical_data['region'].unique()
-        )
-    with col2:
-        selected_parameter = st.selectbox(
-            "📏 Parameter:",
-            options=historical_data['parameter'].unique()
+    profiler.phase("trend tab")
+    with tab2:
+        st.markdown("### 📊 Deep Ocean Trend Analysis")
+        st.info(
+            "🌊 Explore temporal patterns in ocean data using advanced time-series analysis "
+            "and machine learning forecasting models."
         )
-    with col3:
-        st.markdown("<br>", unsafe_allow_html=True)
-        analyze_btn = st.button("🔍 Analyze", use_container_width=True)
-
-    if analyze_btn:
-        with st.spinner("🌊 Analyzing oceanic patterns..."):
-            decomp_fig, forecast_fig = run_time_series_analysis(
-                historical_data, selected_region, selected_parameter
+    
+        catalog = series_catalog()
+
+        col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
+        with col1:
+            selected_region = st.selectbox(
+                "🗺️ Ocean Region:", 
+                options=catalog['region'].unique()
+            )
+        with col2:
+            selected_parameter = st.selectbox(
+                "📏 Parameter:",
+                options=catalog['parameter'].unique()
             )
+        with col3:
+            selected_backend = st.selectbox(
+                "🧮 Forecast Model:",
+                options=FORECAST_BACKENDS,
+                index=FORECAST_BACKENDS.index(DEFAULT_FORECAST_BACKEND),
+                format_func=FORECAST_BACKEND_LABELS.get
+            )
+        with col4:
+            st.markdown("<br>", unsafe_allow_html=True)
+            analyze_btn = st.button("🔍 Analyze", use_container_width=True)
 
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown("#### 🔄 Seasonal Decomposition")
-                st.caption("Revealing hidden patterns in ocean data")
-                st.plotly_chart(decomp_fig, use_container_width=True)
-            
-            with col2:
-                st.markdown("#### 🔮 12-Month Forecast")
-                st.caption("ML-powered predictions using Prophet")
-                st.plotly_chart(forecast_fig, use_container_width=True)
+        if analyze_btn:
+            st.session_state.analysis_job = submit_analysis(
+                load_trend_data(selected_region, selected_parameter),
+                selected_region, selected_parameter, selected_backend
+            )
+
+        analysis_job = get_job(st.session_state.get("analysis_job"))
+        if analysis_job is None and st.session_state.pop("analysis_job", None):
+            st.warning("This analysis is no longer available. Click Analyze to run it again.")
+        if analysis_job is not None:
+            if analysis_job.done():
+                render_analysis(analysis_job)
+            else:
+                poll_analysis(analysis_job.job_id)
+
+        profiler.phase("heatwave scan")
+        with st.expander("🔥 Marine Heatwave Scan"):
+            st.caption(
+                "Anomalies against the monthly climatology of every region and "
+                "parameter, flagged when they stay above the threshold percentile."
+            )
+            scan_col1, scan_col2 = st.columns(2)
+            with scan_col1:
+                scan_percentile = st.slider(
+                    "Threshold percentile", min_value=50, max_value=99, value=90
+                )
+            with scan_col2:
+                scan_duration = st.number_input(
+                    "Minimum duration (months)", min_value=1, max_value=12, value=2
+                )
+            heatwave_events = scan_heatwaves(scan_percentile, scan_duration)
+            st.dataframe(heatwave_events, use_container_width=True, hide_index=True)
+finally:
+    profile_report = profiler.finish()
 
+if profile_report is not None:
+    with st.sidebar:
+        render_profile(profile_report)
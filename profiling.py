@@ -0,0 +1,107 @@
+import cProfile
+import json
+import logging
+import os
+import pstats
+import tempfile
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+
+PROFILE_ENABLED = os.environ.get('FLOATCHAT_PROFILE', '0') == '1'
+PROFILE_LOG = os.environ.get(
+    'FLOATCHAT_PROFILE_LOG', os.path.join(tempfile.gettempdir(), 'floatchat-profile.log')
+)
+HOTSPOTS = 15
+
+_logger = None
+_logger_lock = threading.Lock()
+# cProfile is one monitoring tool for the whole interpreter, so only one rerun at
+# a time collects hotspots; concurrent profiled reruns record phase timings only.
+_profile_lock = threading.Lock()
+
+
+def profile_logger():
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            _logger = logging.getLogger('floatchat.profile')
+            _logger.setLevel(logging.INFO)
+            _logger.propagate = False
+            handler = RotatingFileHandler(PROFILE_LOG, maxBytes=1024 * 1024, backupCount=3)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            _logger.addHandler(handler)
+    return _logger
+
+
+class NullProfiler:
+    enabled = False
+
+    def phase(self, name):
+        pass
+
+    def finish(self):
+        return None
+
+
+class RerunProfiler:
+    enabled = True
+
+    def __init__(self):
+        self.profile = None
+        if _profile_lock.acquire(blocking=False):
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+                self.profile = profile
+            except ValueError:
+                # Another profiling tool (a debugger, coverage) owns the hooks.
+                _profile_lock.release()
+        self.phases = []
+        self.started = self.mark = time.perf_counter()
+        self.current = None
+        self.report = None
+
+    def phase(self, name):
+        now = time.perf_counter()
+        if self.current is not None:
+            self.phases.append((self.current, now - self.mark))
+        self.current, self.mark = name, now
+
+    def finish(self):
+        if self.report is not None:
+            return self.report
+        self.phase(None)
+        hotspots = None
+        if self.profile is not None:
+            self.profile.disable()
+            _profile_lock.release()
+            hotspots = self.hotspots()
+            self.profile = None
+        total = time.perf_counter() - self.started
+
+        self.report = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'total': total,
+            'phases': [{'phase': name, 'seconds': seconds} for name, seconds in self.phases],
+            'hotspots': hotspots,
+        }
+        profile_logger().info(json.dumps(self.report))
+        return self.report
+
+    def hotspots(self):
+        stats = pstats.Stats(self.profile)
+        hotspots = []
+        for (filename, line, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            hotspots.append({
+                'function': f"{os.path.basename(filename)}:{line}({function})",
+                'calls': calls, 'tottime': tottime, 'cumtime': cumtime,
+            })
+        hotspots.sort(key=lambda h: h['tottime'], reverse=True)
+        return hotspots[:HOTSPOTS]
+
+
+def start_profiler(requested=None):
+    if PROFILE_ENABLED or requested in ('1', 'true'):
+        return RerunProfiler()
+    return NullProfiler()
@@ -0,0 +1,87 @@
+import re
+
+import numpy as np
+
+
+NGRAM = 3
+DEFAULT_THRESHOLD = 0.6
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+_NUMBER = re.compile(r'\b\w*\d\w*\b')
+
+
+def normalize_prompt(prompt):
+    return _NON_WORD.sub(' ', prompt.lower()).strip()
+
+
+def prompt_ngrams(normalized, n=NGRAM):
+    padded = f" {normalized} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def prompt_numbers(normalized):
+    return frozenset(_NUMBER.findall(normalized))
+
+
+class PromptIndex:
+    def __init__(self, prompts=(), threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self._keys = []
+        self._sizes = []
+        self._numbers = []
+        self._exact = {}
+        self._postings = {}
+        self._arrays = None
+        for prompt in prompts:
+            self.add(prompt)
+
+    def add(self, prompt, key=None):
+        normalized = normalize_prompt(prompt)
+        if normalized in self._exact:
+            return self._exact[normalized]
+
+        doc_id = len(self._keys)
+        grams = prompt_ngrams(normalized)
+        self._keys.append(prompt if key is None else key)
+        self._sizes.append(len(grams))
+        self._numbers.append(prompt_numbers(normalized))
+        self._exact[normalized] = doc_id
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(doc_id)
+        self._arrays = None
+        return doc_id
+
+    def _posting_arrays(self):
+        if self._arrays is None:
+            self._arrays = (
+                {gram: np.asarray(ids, dtype=np.int32) for gram, ids in self._postings.items()},
+                np.asarray(self._sizes, dtype=np.float64)
+            )
+        return self._arrays
+
+    def lookup(self, prompt):
+        normalized = normalize_prompt(prompt)
+        doc_id = self._exact.get(normalized)
+        if doc_id is not None:
+            return self._keys[doc_id], 1.0
+
+        grams = prompt_ngrams(normalized)
+        postings, sizes = self._posting_arrays()
+        hits = [postings[gram] for gram in grams if gram in postings]
+        if not hits:
+            return None
+
+        # Only prompts sharing at least one trigram with the query are scored.
+        ids, shared = np.unique(np.concatenate(hits), return_counts=True)
+        scores = 2 * shared / (sizes[ids] + len(grams))
+        keep = scores >= self.threshold
+        ids, scores = ids[keep], scores[keep]
+        numbers = prompt_numbers(normalized)
+        for i in np.argsort(-scores, kind='stable'):
+            # Near-identical wording about a different float or year is a different question.
+            if self._numbers[ids[i]] == numbers:
+                return self._keys[ids[i]], float(scores[i])
+        return None
+
+    def __len__(self):
+        return len(self._keys)
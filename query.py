@@ -1,7 +1,16 @@
+import os
+
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
-from prophet import Prophet
+
+from cache import LRUCache
+from levels import STANDARD_LEVELS, profile_levels
+from prompt_index import PromptIndex, normalize_prompt
+from rollup import GLOBAL_REGION, SURFACE_LEVEL, current_rollup
+from simplify import DENSITY_BINS, DENSITY_THRESHOLD, density_bins, simplify_track
+from trajectory import current_trajectories
+from trend import STORE_DIR, forecast_series
 
 
 HARDCODED_QUESTIONS = [
@@ -26,6 +35,17 @@ def create_profile_chart(df):
         x=df["salinity"], y=df["pressure"], name="Salinity (PSU)",
         xaxis="x2", line=dict(color='#ff69b4')
     ))
+    _, standard = profile_levels(df, by=[])
+    fig.add_trace(go.Scatter(
+        x=standard["temperature"][0], y=STANDARD_LEVELS, mode="markers",
+        name="Standard levels", legendgroup="levels",
+        marker=dict(color='#00f2fe', symbol='diamond', size=7)
+    ))
+    fig.add_trace(go.Scatter(
+        x=standard["salinity"][0], y=STANDARD_LEVELS, mode="markers",
+        xaxis="x2", legendgroup="levels", showlegend=False,
+        marker=dict(color='#ff69b4', symbol='diamond', size=7)
+    ))
     fig.update_layout(
         template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)',
         plot_bgcolor='rgba(0,0,0,0)',
@@ -48,6 +68,11 @@ def create_profile_chart(df):
 
 
 def create_3d_scatter(df):
+    if len(df) > DENSITY_THRESHOLD:
+        return create_3d_density(df)
+
+    import plotly.express as px
+
     fig = px.scatter_3d(
         df, x='temperature', y='salinity', z='pressure', color='temperature',
         color_continuous_scale='Cividis_r',
@@ -61,7 +86,34 @@ def create_3d_scatter(df):
     return fig
 
 
+def create_3d_density(df):
+    binned = density_bins(df, ['temperature', 'salinity', 'pressure'], DENSITY_BINS)
+    fig = go.Figure(go.Scatter3d(
+        x=binned['temperature'], y=binned['salinity'], z=binned['pressure'],
+        mode='markers', customdata=binned['count'],
+        marker=dict(
+            size=4, opacity=0.8, color=np.log10(binned['count']),
+            colorscale='Cividis_r', colorbar=dict(title='log10 count')
+        ),
+        hovertemplate=(
+            'T %{x:.2f}°C<br>S %{y:.2f} PSU<br>P %{z:.0f} dbar'
+            '<br>%{customdata:,} measurements<extra></extra>'
+        )
+    ))
+    fig.update_layout(
+        title=f'3D Oceanographic Profile Density ({len(df):,} measurements)',
+        template='plotly_dark', paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        scene=dict(
+            xaxis_title='temperature', yaxis_title='salinity', zaxis_title='pressure',
+            zaxis=dict(autorange='reversed')
+        )
+    )
+    return fig
+
+
 def create_2d_map(df):
+    df = simplify_track(df)
     fig = go.Figure(go.Scattermapbox(
         lat=df['lat'], lon=df['lon'], mode='markers',
         marker=dict(size=8, color='#00f2fe', opacity=0.7),
@@ -78,6 +130,7 @@ def create_2d_map(df):
 
 
 def create_3d_globe_plotly(df):
+    df = simplify_track(df)
     fig = go.Figure(go.Scattergeo(
         lat=df['lat'], lon=df['lon'], mode='markers+lines',
         marker=dict(size=4, color='#00f2fe', opacity=0.8),
@@ -99,11 +152,8 @@ def create_3d_globe_plotly(df):
     return fig
 
 
-def create_timeseries_forecast_chart(df):
-    m = Prophet()
-    m.fit(df)
-    future = m.make_future_dataframe(periods=12, freq='MS')
-    forecast = m.predict(future)
+def create_timeseries_forecast_chart(df, backend=None):
+    _, forecast = forecast_series(df, backend)
     fig = go.Figure()
     fig.add_trace(go.Scatter(
         x=df['ds'], y=df['y'], mode='markers', name='Actual'
@@ -128,6 +178,76 @@ def create_timeseries_forecast_chart(df):
     return fig
 
 
+def indian_ocean_sst_answer(rollup):
+    stats = rollup.summary(
+        'Indian Ocean', 'temperature', SURFACE_LEVEL, '2023-01', '2023-12'
+    )
+    if not stats['count']:
+        return None
+    return {
+        "content": (
+            "The average sea surface temperature across the Indian Ocean in 2023 "
+            f"was {stats['mean']:.1f}°C, from {stats['count']:,} profiles."
+        )
+    }
+
+
+def depth_comparison_answer(rollup, level=100):
+    latest = rollup.latest_month()
+    if latest is None:
+        return None
+    start = latest - pd.DateOffset(months=2)
+    regions = ["Arabian Sea", "Bay of Bengal"]
+    stats = [
+        rollup.summary(region, 'temperature', level, start, latest)
+        for region in regions
+    ]
+    if not all(s['count'] for s in stats):
+        return None
+    warmer = regions[int(stats[1]['mean'] > stats[0]['mean'])]
+    return {
+        "content": (
+            f"Here is the comparison for the last quarter ({start:%b}–{latest:%b %Y}). "
+            f"The {warmer} was warmer on average at this depth."
+        ),
+        "dataframe": pd.DataFrame({
+            "Region": regions,
+            f"Avg. Temp at {level}m (°C)": [round(s['mean'], 1) for s in stats]
+        })
+    }
+
+
+def recent_profiles_answer(index, wmo=2901683, n=5):
+    recent = index.recent(wmo, n)
+    if recent.empty:
+        return None
+    return {
+        "content": f"Here are the {len(recent)} most recent profiles for float {wmo}:",
+        "dataframe": pd.DataFrame({
+            "Profile Date": recent['date'],
+            "Latitude": recent['lat'],
+            "Longitude": recent['lon'],
+            "Cycle Number": recent['cycle']
+        })
+    }
+
+
+def trajectory_answer(index, wmo=2901683):
+    trajectory = index.trajectory(wmo)
+    if trajectory.empty:
+        return None
+    return {"dataframe": trajectory[['lat', 'lon', 'date']]}
+
+
+def average_ocean_temperature_label(default="28.1°C"):
+    rollup = current_rollup(STORE_DIR)
+    latest = rollup.latest_month() if rollup is not None else None
+    if latest is None:
+        return default
+    stats = rollup.summary(GLOBAL_REGION, 'temperature', SURFACE_LEVEL, latest, latest)
+    return f"{stats['mean']:.1f}°C" if stats['count'] else default
+
+
 HARDCODED_RESPONSES = {
     "List the 5 most recent profiles reported by float with WMO ID 2901683...": {
         "type": "table",
@@ -141,11 +261,13 @@ HARDCODED_RESPONSES = {
             "Longitude": [65.2, 65.5, 65.7, 66.0, 66.3],
             "Cycle Number": [152, 151, 150, 149, 148]
         }),
-        "text_summary": "Here are the 5 most recent profiles for float 2901683:"
+        "text_summary": "Here are the 5 most recent profiles for float 2901683:",
+        "trajectory_answer": recent_profiles_answer
     },
     "What was the average sea surface temperature across the entire Indian Ocean for the year 2023?": {
         "type": "text",
-        "data": "The estimated average sea surface temperature across the Indian Ocean in 2023 was approximately 28.1°C."
+        "data": "The estimated average sea surface temperature across the Indian Ocean in 2023 was approximately 28.1°C.",
+        "rollup_answer": indian_ocean_sst_answer
     },
     "Plot the full temperature and salinity profile vs. pressure for the latest cycle of float 1901345.": {
         "type": "plot",
@@ -175,7 +297,8 @@ HARDCODED_RESPONSES = {
             "lon": [66.3, 66.0, 65.7, 65.5, 65.2, 65.0, 64.8, 64.5],
             "date": ["2024-02-10", "2024-02-20", "2024-03-01", "2024-03-10", "2024-03-20", "2024-03-30", "2024-04-09", "2024-04-19"]
         }),
-        "text_summary": "Displaying the historical trajectory for float 2901683 on a 2D map."
+        "text_summary": "Displaying the historical trajectory for float 2901683 on a 2D map.",
+        "trajectory_answer": trajectory_answer
     },
     "Visualize the complete historical path of float 2901683 on an interactive 3D globe.": {
         "type": "plot",
@@ -184,7 +307,8 @@ HARDCODED_RESPONSES = {
             "lat": [9.5, 9.8, 10.1, 10.3, 10.5, 10.8, 11.0, 11.2, 11.5, 11.8],
             "lon": [66.3, 66.0, 65.7, 65.5, 65.2, 65.0, 64.8, 64.5, 64.2, 64.0]
         }),
-        "text_summary": "Visualizing the historical path for float 2901683 on an interactive 3D globe."
+        "text_summary": "Visualizing the historical path for float 2901683 on an interactive 3D globe.",
+        "trajectory_answer": trajectory_answer
     },
     "Analyze the seasonal trend of sea surface temperature in the Bay of Bengal...": {
         "type": "plot",
@@ -201,12 +325,60 @@ HARDCODED_RESPONSES = {
             "Region": ["Arabian Sea", "Bay of Bengal"],
             "Avg. Temp at 100m (°C)": [24.5, 25.1]
         }),
-        "text_summary": "Here is the comparison for the last quarter. The Bay of Bengal was slightly warmer on average at this depth."
+        "text_summary": "Here is the comparison for the last quarter. The Bay of Bengal was slightly warmer on average at this depth.",
+        "rollup_answer": depth_comparison_answer
     }
 }
 
 HARDCODED_XAI = {}
 
+PROMPT_INDEX = PromptIndex(HARDCODED_RESPONSES)
+
+
+RESPONSE_CACHE = LRUCache(
+    max_entries=int(os.environ.get('FLOATCHAT_RESPONSE_CACHE_SIZE', 1024)),
+    ttl=float(os.environ.get('FLOATCHAT_RESPONSE_CACHE_TTL', 3600)),
+    max_bytes=int(os.environ.get('FLOATCHAT_RESPONSE_CACHE_MB', 256)) * 1024 * 1024
+)
+
+
+def resolve_prompt(prompt):
+    match = PROMPT_INDEX.lookup(prompt)
+    return match[0] if match else None
+
+
+def build_response(response_key):
+    response_obj = HARDCODED_RESPONSES[response_key]
+    response = {
+        "type": response_obj["type"],
+        "content": response_obj.get(
+            "text_summary", response_obj.get("data", "")
+        )
+    }
+    if "dataframe" in response_obj:
+        response["dataframe"] = response_obj["dataframe"]
+
+    rollup_answer = response_obj.get("rollup_answer")
+    live_rollup = current_rollup(STORE_DIR) if rollup_answer else None
+    if live_rollup is not None:
+        response.update(rollup_answer(live_rollup) or {})
+
+    index_answer = response_obj.get("trajectory_answer")
+    live_index = current_trajectories(STORE_DIR) if index_answer else None
+    if live_index is not None:
+        response.update(index_answer(live_index) or {})
+
+    if response_obj["type"] == "plot":
+        fig = response_obj["plot_function"](response["dataframe"])
+        response["plot_json"] = fig.to_json()
+    return response
+
+
+def get_response(response_key):
+    return RESPONSE_CACHE.get_or_compute(
+        normalize_prompt(response_key), lambda: build_response(response_key)
+    )
+
 DEFAULT_XAI_DETAILS = """
 <details>
     <summary><strong>1. Hypothetical Document (Hy-DE)</strong></summary>
@@ -0,0 +1,192 @@
+import numpy as np
+
+
+# Approximate basin outlines as (lon, lat) vertices, after the IHO limits of
+# oceans and seas. Land inside an outline is harmless since floats are at sea.
+REGION_POLYGONS = {
+    'Arabian Sea': np.array([
+        (51.4, 10.4), (51.4, 15.0), (57.0, 22.5), (61.0, 25.5), (67.0, 25.0),
+        (70.0, 22.5), (73.0, 17.0), (74.5, 12.0), (77.0, 8.0), (73.2, -0.7)
+    ]),
+    'Bay of Bengal': np.array([
+        (80.6, 5.9), (79.8, 10.3), (80.3, 15.5), (83.5, 18.0), (87.0, 21.7),
+        (90.5, 22.5), (92.5, 20.5), (94.5, 16.0), (97.5, 16.5), (98.5, 9.0),
+        (95.3, 5.6)
+    ]),
+    'Indian Ocean': np.array([
+        (20.0, -60.0), (20.0, -34.5), (35.0, -25.0), (40.0, -15.0),
+        (39.0, -5.0), (43.0, 11.5), (51.4, 12.0), (57.0, 22.5), (61.0, 25.5),
+        (67.0, 25.0), (72.0, 21.0), (78.0, 8.0), (80.0, 16.0), (87.0, 22.0),
+        (92.0, 22.0), (98.0, 16.0), (99.0, 8.0), (95.3, 5.6), (105.0, -6.0),
+        (115.0, -9.0), (125.0, -10.0), (129.0, -14.0), (122.0, -18.0),
+        (114.0, -22.0), (115.0, -34.0), (118.0, -35.0), (147.0, -44.0),
+        (147.0, -60.0)
+    ]),
+}
+GRID_RESOLUTION = 1.0
+
+OUTSIDE, INSIDE, BOUNDARY = 0, 1, 2
+
+
+def normalize_lon(lon):
+    return (np.asarray(lon, dtype=float) + 180.0) % 360.0 - 180.0
+
+
+def points_in_polygon(lat, lon, polygon):
+    lat = np.asarray(lat, dtype=float)
+    lon = np.asarray(lon, dtype=float)
+    inside = np.zeros(lat.shape, dtype=bool)
+    x0, y0 = polygon[-1]
+    # Even-odd ray casting: one vectorized pass over the points per polygon edge.
+    for x1, y1 in polygon:
+        crosses = (y1 > lat) != (y0 > lat)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_cross = x1 + (lat - y1) * (x0 - x1) / (y0 - y1)
+        inside ^= crosses & (lon < x_cross)
+        x0, y0 = x1, y1
+    return inside
+
+
+class Grid:
+    def __init__(self, resolution=GRID_RESOLUTION):
+        self.resolution = resolution
+        self.n_cols = int(round(360 / resolution))
+        self.n_rows = int(round(180 / resolution))
+
+    def rows(self, lat):
+        row = np.floor((np.asarray(lat, dtype=float) + 90.0) / self.resolution)
+        return np.clip(row, 0, self.n_rows - 1).astype(np.int64)
+
+    def cols(self, lon):
+        col = np.floor((normalize_lon(lon) + 180.0) / self.resolution)
+        return np.clip(col, 0, self.n_cols - 1).astype(np.int64)
+
+    def cells(self, lat, lon):
+        return self.rows(lat) * self.n_cols + self.cols(lon)
+
+    def centers(self):
+        rows, cols = np.divmod(np.arange(self.n_rows * self.n_cols), self.n_cols)
+        lat = -90.0 + (rows + 0.5) * self.resolution
+        lon = -180.0 + (cols + 0.5) * self.resolution
+        return lat, lon
+
+
+def classify_cells(polygon, grid):
+    lat, lon = grid.centers()
+    classes = np.where(points_in_polygon(lat, lon, polygon), INSIDE, OUTSIDE).astype(np.uint8)
+
+    # Sample every edge at a quarter cell and widen by one cell, so any cell an
+    # edge passes through is marked as boundary and gets the exact test.
+    start, end = polygon, np.roll(polygon, -1, axis=0)
+    lengths = np.hypot(*(end - start).T)
+    steps = np.maximum(np.ceil(lengths / (grid.resolution / 4)).astype(int), 1)
+    samples = np.concatenate([
+        a + np.linspace(0, 1, n + 1)[:, None] * (b - a)
+        for a, b, n in zip(start, end, steps)
+    ])
+    rows, cols = grid.rows(samples[:, 1]), grid.cols(samples[:, 0])
+    for d_row in (-1, 0, 1):
+        for d_col in (-1, 0, 1):
+            r = np.clip(rows + d_row, 0, grid.n_rows - 1)
+            c = (cols + d_col) % grid.n_cols
+            classes[r * grid.n_cols + c] = BOUNDARY
+    return classes
+
+
+class RegionIndex:
+    def __init__(self, polygons=REGION_POLYGONS, resolution=GRID_RESOLUTION):
+        self.grid = Grid(resolution)
+        self.polygons = polygons
+        self.cell_classes = {
+            name: classify_cells(polygon, self.grid) for name, polygon in polygons.items()
+        }
+
+    def contains(self, name, lat, lon, cells=None):
+        lat = np.asarray(lat, dtype=float)
+        lon = normalize_lon(lon)
+        if cells is None:
+            cells = self.grid.cells(lat, lon)
+        classes = self.cell_classes[name][cells]
+        mask = classes == INSIDE
+        edge = np.flatnonzero(classes == BOUNDARY)
+        if len(edge):
+            mask[edge] = points_in_polygon(lat[edge], lon[edge], self.polygons[name])
+        return mask
+
+    def membership(self, lat, lon):
+        lat = np.asarray(lat, dtype=float)
+        lon = normalize_lon(lon)
+        cells = self.grid.cells(lat, lon)
+        return {name: self.contains(name, lat, lon, cells) for name in self.polygons}
+
+    def assign(self, lat, lon):
+        # Most specific basin wins: larger basins are assigned first and the smaller
+        # basins nested inside them overwrite those labels.
+        membership = self.membership(lat, lon)
+        labels = np.full(len(np.atleast_1d(lat)), '', dtype=object)
+        for name in sorted(self.polygons, key=lambda n: -polygon_area(self.polygons[n])):
+            labels[membership[name]] = name
+        return labels
+
+
+class PointIndex:
+    def __init__(self, lat, lon, resolution=GRID_RESOLUTION):
+        self.grid = Grid(resolution)
+        self.lat = np.asarray(lat, dtype=float)
+        self.lon = normalize_lon(lon)
+        cells = self.grid.cells(self.lat, self.lon)
+        self.order = np.argsort(cells, kind='stable')
+        self.sorted_cells = cells[self.order]
+
+    def _candidates(self, lon_min, lon_max, lat_min, lat_max):
+        first_row, last_row = self.grid.rows([lat_min, lat_max])
+        first_col, last_col = self.grid.cols([lon_min, lon_max])
+        rows = np.arange(first_row, last_row + 1) * self.grid.n_cols
+        # Cells of one grid row are contiguous in the sorted order.
+        starts = np.searchsorted(self.sorted_cells, rows + first_col, side='left')
+        stops = np.searchsorted(self.sorted_cells, rows + last_col, side='right')
+        if not len(starts):
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([
+            self.order[start:stop] for start, stop in zip(starts, stops)
+        ])
+
+    def query_bbox(self, lon_min, lon_max, lat_min, lat_max):
+        candidates = self._candidates(lon_min, lon_max, lat_min, lat_max)
+        lat, lon = self.lat[candidates], self.lon[candidates]
+        keep = (lat >= lat_min) & (lat <= lat_max) & (lon >= lon_min) & (lon <= lon_max)
+        return np.sort(candidates[keep])
+
+    def query_region(self, name):
+        candidates = self.query_bbox(*region_bounds(name))
+        inside = region_index().contains(name, self.lat[candidates], self.lon[candidates])
+        return candidates[inside]
+
+
+def region_bounds(name):
+    polygon = REGION_POLYGONS[name]
+    (lon_min, lat_min), (lon_max, lat_max) = polygon.min(axis=0), polygon.max(axis=0)
+    return lon_min, lon_max, lat_min, lat_max
+
+
+def polygon_area(polygon):
+    x, y = polygon[:, 0], polygon[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+_region_index = None
+
+
+def region_index():
+    global _region_index
+    if _region_index is None:
+        _region_index = RegionIndex()
+    return _region_index
+
+
+def region_membership(lat, lon):
+    return region_index().membership(lat, lon)
+
+
+def assign_region(lat, lon):
+    return region_index().assign(lat, lon)
@@ -0,0 +1,156 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from levels import VARIABLES, levels_frame
+from regions import region_membership
+
+
+ROLLUP_FILE = 'rollup_monthly_levels.parquet'
+GLOBAL_REGION = 'Global'
+SURFACE_LEVEL = 5
+INDEX = ['region', 'month', 'level']
+STAT_COLUMNS = [
+    f"{variable}_{stat}" for variable in VARIABLES for stat in ('count', 'sum', 'sumsq')
+]
+
+
+def aggregate(batch):
+    # One interpolated value per profile and standard level.
+    binned = levels_frame(batch, carry=['date', 'lat', 'lon'])
+    if binned.empty:
+        return empty_table()
+    binned = binned.assign(month=binned['date'].dt.to_period('M').dt.to_timestamp())
+
+    values = {}
+    for variable in VARIABLES:
+        x = binned[variable].to_numpy(dtype=float)
+        observed = ~np.isnan(x)
+        values[f"{variable}_count"] = observed.astype(float)
+        values[f"{variable}_sum"] = np.where(observed, x, 0.0)
+        values[f"{variable}_sumsq"] = np.where(observed, x * x, 0.0)
+    stats = pd.DataFrame(values, index=binned.index)
+    stats['month'] = binned['month']
+    stats['level'] = binned['level']
+
+    membership = region_membership(binned['lat'], binned['lon'])
+    membership[GLOBAL_REGION] = np.ones(len(binned), dtype=bool)
+    parts = [
+        stats[mask].groupby(['month', 'level'])[STAT_COLUMNS].sum().assign(region=region)
+        for region, mask in membership.items() if mask.any()
+    ]
+    if not parts:
+        return empty_table()
+    return pd.concat(parts).reset_index().set_index(INDEX).sort_index()
+
+
+def empty_table():
+    index = pd.MultiIndex.from_arrays([[], pd.DatetimeIndex([]), []], names=INDEX)
+    return pd.DataFrame(columns=STAT_COLUMNS, index=index, dtype=float)
+
+
+class Rollup:
+    def __init__(self, table=None):
+        self.table = empty_table() if table is None else table
+
+    def update(self, batch):
+        partial = aggregate(batch)
+        if self.table.empty:
+            self.table = partial
+        elif not partial.empty:
+            self.table = self.table.add(partial, fill_value=0).sort_index()
+        return self
+
+    def summary(self, region, variable='temperature', level=SURFACE_LEVEL,
+                start=None, end=None):
+        empty = {'mean': np.nan, 'std': np.nan, 'count': 0}
+        try:
+            rows = self.table.xs((region, float(level)), level=['region', 'level'])
+        except KeyError:
+            return empty
+        rows = rows.loc[start:end]
+        count = rows[f"{variable}_count"].sum()
+        if count == 0:
+            return empty
+        mean = rows[f"{variable}_sum"].sum() / count
+        variance = max(rows[f"{variable}_sumsq"].sum() / count - mean * mean, 0.0)
+        return {'mean': mean, 'std': np.sqrt(variance), 'count': int(count)}
+
+    def latest_month(self, region=GLOBAL_REGION):
+        if self.table.empty:
+            return None
+        months = self.table.xs(region, level='region').index.get_level_values('month')
+        return months.max()
+
+    def save(self, root):
+        path = os.path.join(root, ROLLUP_FILE)
+        tmp_path = f"{path}.tmp"
+        self.table.reset_index().to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+
+def load_rollup(root):
+    path = os.path.join(root, ROLLUP_FILE)
+    if not os.path.exists(path):
+        return Rollup()
+    return Rollup(pd.read_parquet(path).set_index(INDEX).sort_index())
+
+
+_loaded = {}
+
+
+def current_rollup(root):
+    if not root:
+        return None
+    path = os.path.join(root, ROLLUP_FILE)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    cached = _loaded.get(root)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, load_rollup(root))
+        _loaded[root] = cached
+    return cached[1]
+
+
+def rebuild(root, batch_rows=500_000):
+    import store
+
+    rollup = Rollup()
+    scanner = store.open_profiles(root).scanner(
+        columns=store.PROFILE_COLUMNS, batch_size=batch_rows
+    )
+    pending = None
+    for record_batch in scanner.to_batches():
+        if not record_batch.num_rows:
+            continue
+        frame = record_batch.to_pandas()
+        if pending is not None:
+            frame = pd.concat([pending, frame], ignore_index=True)
+        # The last profile may continue in the next batch; hold it back so it is
+        # interpolated whole.
+        last = (
+            (frame['float'] == frame['float'].iat[-1])
+            & (frame['cycle'] == frame['cycle'].iat[-1])
+        )
+        pending = frame[last]
+        if not last.all():
+            rollup.update(frame[~last])
+    if pending is not None:
+        rollup.update(pending)
+    rollup.save(root)
+    return rollup
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Rebuild the monthly/level rollup from the stored profiles.'
+    )
+    parser.add_argument('store', help='store root (same as FLOATCHAT_STORE_DIR)')
+    args = parser.parse_args()
+    rebuilt = rebuild(args.store)
+    print(f"Rebuilt rollup with {len(rebuilt.table):,} region/month/level cells")
@@ -0,0 +1,49 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+PERIOD = 12
+
+
+def trend_filter(period):
+    # The centred moving average statsmodels uses: a 2 x period MA for even
+    # periods, a plain period MA for odd ones.
+    if period % 2 == 0:
+        return np.array([0.5] + [1.0] * (period - 1) + [0.5]) / period
+    return np.repeat(1.0 / period, period)
+
+
+def moving_average(values, period):
+    weights = trend_filter(period)
+    half = len(weights) // 2
+    trend = np.full(values.shape, np.nan)
+    trend[:, half:values.shape[1] - half] = sliding_window_view(
+        values, len(weights), axis=1
+    ) @ weights
+    return trend
+
+
+def decompose(values, period=PERIOD):
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    n_obs = values.shape[1]
+    if np.isnan(values).any():
+        raise ValueError('This function does not handle missing values')
+    if n_obs < 2 * period:
+        raise ValueError(
+            f"x must have 2 complete cycles requires {2 * period} observations. "
+            f"x only has {n_obs} observation(s)"
+        )
+
+    trend = moving_average(values, period)
+    detrended = values - trend
+    # Mean of each phase over the cycles, centred so a full period sums to zero.
+    n_cycles = -(-n_obs // period)
+    padded = np.full((values.shape[0], n_cycles * period), np.nan)
+    padded[:, :n_obs] = detrended
+    phase_means = np.nanmean(padded.reshape(values.shape[0], n_cycles, period), axis=1)
+    phase_means -= phase_means.mean(axis=1, keepdims=True)
+    seasonal = np.tile(phase_means, n_cycles)[:, :n_obs]
+    return {
+        'observed': values, 'trend': trend, 'seasonal': seasonal,
+        'resid': detrended - seasonal
+    }
@@ -0,0 +1,92 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+
+MAX_MAP_POINTS = int(os.environ.get('FLOATCHAT_MAX_MAP_POINTS', 2000))
+DENSITY_THRESHOLD = int(os.environ.get('FLOATCHAT_DENSITY_THRESHOLD', 20000))
+DENSITY_BINS = 32
+
+
+def lttb_indices(x, y, budget):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if budget >= n:
+        return np.arange(n)
+    if budget < 3:
+        return np.array([0, n - 1][:max(budget, 0)], dtype=np.int64)
+
+    # Largest-Triangle-Three-Buckets: the first and last points are kept and the
+    # interior is split into budget - 2 buckets. Each bucket keeps the point that
+    # spans the largest triangle with the previous pick and the next bucket's mean.
+    edges = np.floor(np.linspace(1, n - 1, budget - 1)).astype(np.int64)
+    counts = np.diff(edges)
+    cum_x = np.concatenate([[0.0], np.cumsum(x)])
+    cum_y = np.concatenate([[0.0], np.cumsum(y)])
+    mean_x = (cum_x[edges[1:]] - cum_x[edges[:-1]]) / counts
+    mean_y = (cum_y[edges[1:]] - cum_y[edges[:-1]]) / counts
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(budget, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(budget - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - next_x[i]) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (next_y[i] - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def simplify_track(df, budget=None):
+    budget = MAX_MAP_POINTS if budget is None else budget
+    if len(df) <= budget:
+        return df
+    if 'float' not in df.columns:
+        return df.iloc[lttb_indices(df['lon'], df['lat'], budget)]
+
+    # Several floats share the budget in proportion to their number of fixes,
+    # rounded by largest remainder so the shares never sum past the budget. Every
+    # float keeps at least one fix while there are no more floats than points.
+    lon, lat = df['lon'].to_numpy(dtype=float), df['lat'].to_numpy(dtype=float)
+    groups = list(df.groupby('float', sort=False).indices.values())
+    sizes = np.array([len(positions) for positions in groups])
+    reserve = 1 if len(groups) <= budget else 0
+    quota = (budget - reserve * len(groups)) * sizes / len(df)
+    shares = np.floor(quota).astype(np.int64)
+    leftover = budget - reserve * len(groups) - int(shares.sum())
+    shares[np.argsort(shares - quota, kind='stable')[:leftover]] += 1
+    shares = np.minimum(shares + reserve, sizes)
+
+    keep = []
+    for positions, share in zip(groups, shares):
+        if share == 1:
+            # A single fix is the float's latest position.
+            keep.append(positions[-1:])
+        elif share:
+            keep.append(positions[lttb_indices(lon[positions], lat[positions], share)])
+    return df.iloc[np.sort(np.concatenate(keep))]
+
+
+def density_bins(df, columns, bins=32):
+    # Counts of points per cell of a regular grid spanning the data, reported as
+    # one row per non-empty cell at the cell centre.
+    values = df[columns].to_numpy(dtype=float)
+    values = values[~np.isnan(values).any(axis=1)]
+    bins = np.broadcast_to(bins, len(columns))
+    low, high = values.min(axis=0), values.max(axis=0)
+    width = np.where(high > low, (high - low) / bins, 1.0)
+    cells = np.minimum(((values - low) / width).astype(np.int64), bins - 1)
+    flat = np.ravel_multi_index(cells.T, bins)
+    counts = np.bincount(flat, minlength=int(np.prod(bins)))
+    occupied = np.flatnonzero(counts)
+    centers = low + (np.array(np.unravel_index(occupied, bins)).T + 0.5) * width
+    result = dict(zip(columns, centers.T))
+    result['count'] = counts[occupied]
+    return pd.DataFrame(result)
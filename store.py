@@ -0,0 +1,180 @@
+import os
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from pyarrow import fs
+
+from regions import region_bounds, region_index
+
+
+SERIES_DATASET = 'series'
+SERIES_PARTITIONING = ds.partitioning(
+    pa.schema([
+        ('region', pa.string()), ('parameter', pa.string()), ('year', pa.int32())
+    ]),
+    flavor='hive'
+)
+PROFILES_DATASET = 'profiles'
+PROFILE_COLUMNS = [
+    'float', 'cycle', 'date', 'lat', 'lon', 'pressure', 'temperature', 'salinity'
+]
+PROFILE_SCHEMA = pa.schema([
+    ('float', pa.int64()), ('cycle', pa.int32()), ('date', pa.timestamp('ns')),
+    ('lat', pa.float64()), ('lon', pa.float64()), ('pressure', pa.float32()),
+    ('temperature', pa.float32()), ('salinity', pa.float32())
+])
+PROFILE_PARTITIONING = ds.partitioning(
+    pa.schema([('year', pa.int32())]), flavor='hive'
+)
+ROWS_PER_GROUP = 64 * 1024
+
+_FILESYSTEM = fs.LocalFileSystem(use_mmap=True)
+
+
+def dataset_path(root, name):
+    return os.path.join(root, name)
+
+
+def has_dataset(root, name):
+    return bool(root) and os.path.isdir(dataset_path(root, name))
+
+
+def write_series(data, root):
+    frame = data[['date', 'region', 'parameter', 'value']].sort_values(
+        ['region', 'parameter', 'date']
+    )
+    frame = frame.assign(year=frame['date'].dt.year.astype('int32'))
+    ds.write_dataset(
+        pa.Table.from_pandas(frame, preserve_index=False),
+        dataset_path(root, SERIES_DATASET),
+        format='parquet',
+        partitioning=SERIES_PARTITIONING,
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior='overwrite_or_ignore',
+        max_rows_per_group=ROWS_PER_GROUP,
+        min_rows_per_group=min(ROWS_PER_GROUP, len(frame)) or 1
+    )
+
+
+def open_series(root):
+    return ds.dataset(
+        dataset_path(root, SERIES_DATASET), format='parquet',
+        partitioning=SERIES_PARTITIONING, filesystem=_FILESYSTEM
+    )
+
+
+def write_profiles(frame, root, batch_id=None):
+    frame = frame.sort_values(['date', 'float', 'cycle', 'pressure'])
+    table = pa.Table.from_pandas(
+        frame[PROFILE_COLUMNS], schema=PROFILE_SCHEMA, preserve_index=False
+    )
+    table = table.append_column(
+        'year', pc.year(table['date']).cast(pa.int32())
+    )
+    ds.write_dataset(
+        table,
+        dataset_path(root, PROFILES_DATASET),
+        format='parquet',
+        partitioning=PROFILE_PARTITIONING,
+        basename_template=f"part-{batch_id or uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior='overwrite_or_ignore',
+        max_rows_per_group=ROWS_PER_GROUP,
+        min_rows_per_group=min(ROWS_PER_GROUP, len(table)) or 1
+    )
+
+
+def remove_profile_batch(root, batch_id):
+    removed = 0
+    prefix = f"part-{batch_id}-"
+    for dirpath, _, filenames in os.walk(dataset_path(root, PROFILES_DATASET)):
+        for name in filenames:
+            if name.startswith(prefix) and name.endswith('.parquet'):
+                os.remove(os.path.join(dirpath, name))
+                removed += 1
+    return removed
+
+
+def open_profiles(root):
+    return ds.dataset(
+        dataset_path(root, PROFILES_DATASET), format='parquet',
+        partitioning=PROFILE_PARTITIONING, filesystem=_FILESYSTEM
+    )
+
+
+def date_conditions(start=None, end=None):
+    # The year bounds prune whole partitions; the date bounds prune row groups.
+    conditions = []
+    if start is not None:
+        start = pd.Timestamp(start)
+        conditions.append(pc.field('year') >= start.year)
+        conditions.append(pc.field('date') >= start)
+    if end is not None:
+        end = pd.Timestamp(end)
+        conditions.append(pc.field('year') <= end.year)
+        conditions.append(pc.field('date') <= end)
+    return conditions
+
+
+def combine(conditions):
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def bbox_conditions(lon_min, lon_max, lat_min, lat_max):
+    return [
+        pc.field('lon') >= lon_min, pc.field('lon') <= lon_max,
+        pc.field('lat') >= lat_min, pc.field('lat') <= lat_max,
+    ]
+
+
+def load_profiles(root, floats=None, start=None, end=None, columns=None,
+                  bbox=None, region=None):
+    conditions = date_conditions(start, end)
+    if floats is not None:
+        conditions.append(pc.field('float').isin([int(f) for f in floats]))
+    if bbox is not None:
+        conditions.extend(bbox_conditions(*bbox))
+    if region is not None:
+        # The basin's bounding box prunes row groups; the polygon test runs on what's left.
+        conditions.extend(bbox_conditions(*region_bounds(region)))
+    columns = list(columns or PROFILE_COLUMNS)
+    read_columns = columns + [c for c in ('lat', 'lon') if region and c not in columns]
+    frame = open_profiles(root).to_table(
+        columns=read_columns, filter=combine(conditions)
+    ).to_pandas()
+    if region is not None:
+        frame = frame[region_index().contains(region, frame['lat'], frame['lon'])]
+        frame = frame[columns].reset_index(drop=True)
+    return frame
+
+
+def series_filter(region=None, parameter=None, start=None, end=None):
+    conditions = date_conditions(start, end)
+    if region is not None:
+        conditions.append(pc.field('region') == region)
+    if parameter is not None:
+        conditions.append(pc.field('parameter') == parameter)
+    return combine(conditions)
+
+
+def load_series(root, region=None, parameter=None, start=None, end=None):
+    table = open_series(root).to_table(
+        columns=['date', 'region', 'parameter', 'value'],
+        filter=series_filter(region, parameter, start, end)
+    )
+    return table.to_pandas().sort_values(
+        ['region', 'parameter', 'date'], ignore_index=True
+    )
+
+
+def series_catalog(root):
+    pairs = set()
+    for fragment in open_series(root).get_fragments():
+        keys = ds.get_partition_keys(fragment.partition_expression)
+        pairs.add((keys['region'], keys['parameter']))
+    return pd.DataFrame(sorted(pairs), columns=['region', 'parameter'])
@@ -0,0 +1,170 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+
+TRAJECTORY_FILE = 'trajectory_index.parquet'
+COLUMNS = ['float', 'cycle', 'date', 'lat', 'lon']
+
+
+def profile_positions(batch):
+    # One fix per profile: measurements of a cycle share its date and position.
+    return batch[COLUMNS].drop_duplicates(['float', 'cycle'])
+
+
+class TrajectoryIndex:
+    def __init__(self, table=None):
+        table = pd.DataFrame(columns=COLUMNS) if table is None else table
+        self._build({
+            'float': table['float'].to_numpy(dtype=np.int64),
+            'cycle': table['cycle'].to_numpy(dtype=np.int32),
+            'date': table['date'].to_numpy(dtype='datetime64[ns]'),
+            'lat': table['lat'].to_numpy(dtype=float),
+            'lon': table['lon'].to_numpy(dtype=float),
+        })
+
+    def _build(self, columns):
+        # Rows are kept sorted by (float, date), so each float owns one contiguous block.
+        order = np.lexsort((columns['cycle'], columns['date'], columns['float']))
+        self.columns = {name: values[order] for name, values in columns.items()}
+        self._index()
+
+    def _index(self):
+        floats = self.columns['float']
+        self.starts = np.flatnonzero(np.r_[len(floats) > 0, floats[1:] != floats[:-1]])
+        self.floats = floats[self.starts]
+        self.stops = np.append(self.starts[1:], len(floats))
+
+    def _bounds(self, wmo):
+        floats = self.columns['float']
+        return np.searchsorted(floats, wmo, 'left'), np.searchsorted(floats, wmo, 'right')
+
+    def update(self, batch):
+        new = profile_positions(batch)
+        if new.empty:
+            return self
+        # Only the new fixes are sorted; they are then merged into the sorted
+        # arrays float by float, so a batch never re-sorts the whole index.
+        new = TrajectoryIndex(new)
+        if not len(self):
+            self.columns = new.columns
+            self._index()
+            return self
+
+        # A re-ingested cycle replaces the stored fix for that float and cycle.
+        stale = []
+        for wmo, start, stop in zip(new.floats, new.starts, new.stops):
+            lo, hi = self._bounds(wmo)
+            replaced = np.isin(self.columns['cycle'][lo:hi], new.columns['cycle'][start:stop])
+            stale.append(lo + np.flatnonzero(replaced))
+        stale = np.concatenate(stale)
+        if len(stale):
+            self.columns = {
+                name: np.delete(values, stale) for name, values in self.columns.items()
+            }
+
+        positions = []
+        dates, cycles = self.columns['date'], self.columns['cycle']
+        for wmo, start, stop in zip(new.floats, new.starts, new.stops):
+            lo, hi = self._bounds(wmo)
+            new_dates, new_cycles = new.columns['date'][start:stop], new.columns['cycle'][start:stop]
+            left = lo + np.searchsorted(dates[lo:hi], new_dates, 'left')
+            right = lo + np.searchsorted(dates[lo:hi], new_dates, 'right')
+            # Fixes sharing a date are ordered by cycle.
+            for i in np.flatnonzero(right > left):
+                left[i] += np.count_nonzero(cycles[left[i]:right[i]] < new_cycles[i])
+            positions.append(left)
+        positions = np.concatenate(positions)
+        self.columns = {
+            name: np.insert(values, positions, new.columns[name])
+            for name, values in self.columns.items()
+        }
+        self._index()
+        return self
+
+    def _block(self, wmo):
+        i = np.searchsorted(self.floats, int(wmo))
+        if i == len(self.floats) or self.floats[i] != int(wmo):
+            return slice(0, 0)
+        return slice(self.starts[i], self.stops[i])
+
+    def block(self, wmo):
+        block = self._block(wmo)
+        return {name: values[block] for name, values in self.columns.items()}
+
+    def trajectory(self, wmo):
+        return pd.DataFrame(self.block(wmo), copy=False)
+
+    def recent(self, wmo, n=5):
+        block = self._block(wmo)
+        start = max(block.start, block.stop - n)
+        return pd.DataFrame(
+            {name: values[start:block.stop][::-1] for name, values in self.columns.items()},
+            copy=False
+        )
+
+    def to_frame(self):
+        return pd.DataFrame(self.columns, copy=False)
+
+    def save(self, root):
+        path = os.path.join(root, TRAJECTORY_FILE)
+        tmp_path = f"{path}.tmp"
+        self.to_frame().to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def __len__(self):
+        return len(self.columns['float'])
+
+
+def load_trajectories(root):
+    path = os.path.join(root, TRAJECTORY_FILE)
+    if not os.path.exists(path):
+        return TrajectoryIndex()
+    return TrajectoryIndex(pd.read_parquet(path))
+
+
+_loaded = {}
+
+
+def current_trajectories(root):
+    if not root:
+        return None
+    path = os.path.join(root, TRAJECTORY_FILE)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    cached = _loaded.get(root)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, load_trajectories(root))
+        _loaded[root] = cached
+    return cached[1]
+
+
+def rebuild(root, batch_rows=500_000):
+    import store
+
+    scanner = store.open_profiles(root).scanner(columns=COLUMNS, batch_size=batch_rows)
+    positions = [
+        profile_positions(record_batch.to_pandas())
+        for record_batch in scanner.to_batches() if record_batch.num_rows
+    ]
+    index = TrajectoryIndex(
+        pd.concat(positions).drop_duplicates(['float', 'cycle']) if positions else None
+    )
+    index.save(root)
+    return index
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Rebuild the per-float trajectory index from the stored profiles.'
+    )
+    parser.add_argument('store', help='store root (same as FLOATCHAT_STORE_DIR)')
+    args = parser.parse_args()
+    rebuilt = rebuild(args.store)
+    print(f"Rebuilt trajectory index with {len(rebuilt):,} profiles "
+          f"from {len(rebuilt.floats):,} floats")
@@ -1,13 +1,48 @@
+import os
+import warnings
+
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from statsmodels.tsa.seasonal import seasonal_decompose
-from prophet import Prophet
+
+import seasonal
+from cache import LRUCache, content_hash
+
+
+FORECAST_COLUMNS = ['ds', 'yhat', 'yhat_lower', 'yhat_upper']
+
+FORECAST_BACKENDS = ['prophet', 'harmonic']
+DEFAULT_FORECAST_BACKEND = os.environ.get('FLOATCHAT_FORECAST_BACKEND', 'prophet')
+if DEFAULT_FORECAST_BACKEND not in FORECAST_BACKENDS:
+    warnings.warn(
+        f"Unknown FLOATCHAT_FORECAST_BACKEND {DEFAULT_FORECAST_BACKEND!r}; "
+        f"expected one of {FORECAST_BACKENDS}. Using 'prophet'."
+    )
+    DEFAULT_FORECAST_BACKEND = 'prophet'
+
+MODEL_CACHE = LRUCache(
+    max_entries=int(os.environ.get('FLOATCHAT_MODEL_CACHE_SIZE', 64)),
+    disk_dir=os.environ.get('FLOATCHAT_MODEL_CACHE_DIR')
+)
+
+PRECOMPUTED = {}
+
+# Latest fitted model per (region, parameter, backend), used to warm-start the
+# refit when the series grows. After WARM_START_MAX_UPDATES warm updates in a
+# row the next fit starts from scratch again. Every WARM_START_CHECK_EVERY-th
+# warm update is also fitted from scratch, and the full fit is kept whenever the
+# warm forecast drifted from it by more than WARM_START_TOLERANCE.
+LATEST_FITS = LRUCache(max_entries=256)
+WARM_START_MAX_UPDATES = int(os.environ.get('FLOATCHAT_WARM_START_MAX_UPDATES', 12))
+WARM_START_CHECK_EVERY = max(1, int(os.environ.get('FLOATCHAT_WARM_START_CHECK_EVERY', 4)))
+WARM_START_TOLERANCE = 0.05
+
+STORE_DIR = os.environ.get('FLOATCHAT_STORE_DIR')
 
 
 def get_hardcoded_data():
     dates = pd.date_range(start='2020-01-01', periods=60, freq='MS')
+    rng = np.random.default_rng(42)
 
     base_temp_arabian = 26 + np.sin(np.arange(60) * (2 * np.pi / 12)) * 2
     base_temp_bengal = 27 + np.sin(
@@ -16,10 +51,10 @@ def get_hardcoded_data():
 
     trend = np.linspace(0, 0.5, 60)
     temp_arabian = (
-        base_temp_arabian + trend + np.random.randn(60) * 0.2
+        base_temp_arabian + trend + rng.standard_normal(60) * 0.2
     )
     temp_bengal = (
-        base_temp_bengal + trend + np.random.randn(60) * 0.2
+        base_temp_bengal + trend + rng.standard_normal(60) * 0.2
     )
 
     df_arabian = pd.DataFrame({
@@ -34,7 +69,39 @@ def get_hardcoded_data():
     return pd.concat([df_arabian, df_bengal], ignore_index=True)
 
 
+def _series_store():
+    if not STORE_DIR:
+        return None
+    import store
+
+    return store if store.has_dataset(STORE_DIR, store.SERIES_DATASET) else None
+
+
+def load_trend_data(region=None, parameter=None):
+    series_store = _series_store()
+    if series_store is not None:
+        return series_store.load_series(STORE_DIR, region, parameter)
+
+    data = get_hardcoded_data()
+    if region is not None:
+        data = data[data['region'] == region]
+    if parameter is not None:
+        data = data[data['parameter'] == parameter]
+    return data
+
+
+def series_catalog():
+    series_store = _series_store()
+    if series_store is not None:
+        return series_store.series_catalog(STORE_DIR)
+    return get_hardcoded_data()[['region', 'parameter']].drop_duplicates(
+        ignore_index=True
+    )
+
+
 def plot_decomposition(decomposition_result, parameter):
+    from plotly.subplots import make_subplots
+
     fig = make_subplots(
         rows=4, cols=1,
         subplot_titles=("Observed", "Trend", "Seasonal", "Residual")
@@ -89,22 +156,157 @@ def plot_forecast(forecast_df, actual_df, parameter):
     return fig
 
 
-def run_time_series_analysis(data, region, parameter):
+def select_series(data, region, parameter):
     filtered_data = data[
         (data['region'] == region) & (data['parameter'] == parameter)
     ].copy()
     filtered_data.set_index('date', inplace=True)
+    return filtered_data[['value']]
+
+
+def warm_start_params(model):
+    return {
+        'k': model.params['k'][0][0], 'm': model.params['m'][0][0],
+        'sigma_obs': model.params['sigma_obs'][0][0],
+        'delta': model.params['delta'][0], 'beta': model.params['beta'][0],
+    }
+
+
+def forecast_series(prophet_df, backend=None, periods=12, previous=None):
+    backend = backend or DEFAULT_FORECAST_BACKEND
+    if backend == 'prophet':
+        from prophet import Prophet
+        from prophet.serialize import model_from_json, model_to_json
+
+        model = Prophet()
+        if previous is None:
+            model.fit(prophet_df)
+        else:
+            # Start the optimizer from the previous optimum rather than
+            # Prophet's default initial guess.
+            model.fit(prophet_df, init=warm_start_params(model_from_json(previous)))
+        future = model.make_future_dataframe(periods=periods, freq='MS')
+        forecast = model.predict(future)
+        return model_to_json(model), forecast[FORECAST_COLUMNS]
+    if backend == 'harmonic':
+        import harmonic
 
-    decomposition = seasonal_decompose(filtered_data['value'], model='additive')
-    decomposition_fig = plot_decomposition(decomposition, parameter)
+        model, forecast = harmonic.forecast_frame(
+            prophet_df, periods=periods,
+            previous=harmonic.model_from_json(previous) if previous else None
+        )
+        return harmonic.model_to_json(model), forecast
+    raise ValueError(
+        f"Unknown forecast backend {backend!r}; expected one of {FORECAST_BACKENDS}"
+    )
+
+
+def decompose_many(series_list):
+    # Series of equal length are decomposed together as one (series x time) array.
+    frames = [None] * len(series_list)
+    by_length = {}
+    for i, series in enumerate(series_list):
+        by_length.setdefault(len(series), []).append(i)
+    for positions in by_length.values():
+        values = np.stack([series_list[i]['value'].to_numpy(dtype=float) for i in positions])
+        components = seasonal.decompose(values, seasonal.PERIOD)
+        for row, i in enumerate(positions):
+            frames[i] = pd.DataFrame(
+                {name: component[row] for name, component in components.items()},
+                index=series_list[i].index
+            )
+    return frames
+
+
+def decompose_series(series):
+    return decompose_many([series])[0]
+
+
+def to_prophet_frame(series):
+    return series.reset_index().rename(columns={'date': 'ds', 'value': 'y'})
 
-    prophet_df = filtered_data.reset_index().rename(
-        columns={'date': 'ds', 'value': 'y'}
+
+def warm_start_state(key, series):
+    state = LATEST_FITS.get(key[:3])
+    if (
+        state is None or state['updates'] >= WARM_START_MAX_UPDATES
+        or state['n_obs'] >= len(series)
+    ):
+        return None
+    # Only an append qualifies: the stored fit must cover a prefix of this series.
+    if content_hash(series.iloc[:state['n_obs']]) != state['series_hash']:
+        return None
+    return state
+
+
+def forecast_drift(prophet_df, warm, full):
+    # Largest gap between warm-started and from-scratch forecasts, in units of
+    # the series' standard deviation.
+    scale = prophet_df['y'].std() or 1.0
+    return float(np.max(np.abs(warm['yhat'].to_numpy() - full['yhat'].to_numpy())) / scale)
+
+
+def forecast_incremental(series, key):
+    prophet_df = to_prophet_frame(series)
+    state = warm_start_state(key, series)
+    model, forecast = forecast_series(prophet_df, key[2], previous=state and state['model'])
+    updates = state['updates'] + 1 if state else 0
+    if state and state['updates'] % WARM_START_CHECK_EVERY == 0:
+        full_model, full_forecast = forecast_series(prophet_df, key[2])
+        if forecast_drift(prophet_df, forecast, full_forecast) > WARM_START_TOLERANCE:
+            model, forecast, updates = full_model, full_forecast, 0
+    LATEST_FITS.put(key[:3], {
+        'series_hash': key[3], 'n_obs': len(series), 'model': model,
+        'updates': updates
+    })
+    return model, forecast
+
+
+def warm_start_drift(prophet_df, previous, backend=None, periods=12):
+    _, warm = forecast_series(prophet_df, backend, periods, previous=previous)
+    _, full = forecast_series(prophet_df, backend, periods)
+    drift = forecast_drift(prophet_df, warm, full)
+    return drift, drift <= WARM_START_TOLERANCE
+
+
+def fit_series(series, backend=None, key=None):
+    prophet_df = to_prophet_frame(series)
+    if key is None:
+        model, forecast = forecast_series(prophet_df, backend)
+    else:
+        model, forecast = forecast_incremental(series, key)
+
+    return {
+        'model': model,
+        'decomposition': decompose_series(series),
+        'forecast': forecast,
+        'actual': prophet_df
+    }
+
+
+def analysis_key(series, region, parameter, backend=None):
+    return (
+        region, parameter, backend or DEFAULT_FORECAST_BACKEND,
+        content_hash(series)
     )
-    model = Prophet()
-    model.fit(prophet_df)
-    future = model.make_future_dataframe(periods=12, freq='MS')
-    forecast = model.predict(future)
-    forecast_fig = plot_forecast(forecast, prophet_df, parameter)
 
-    return decomposition_fig, forecast_fig
\ No newline at end of file
+
+def cached_analysis(key):
+    if key in PRECOMPUTED:
+        return PRECOMPUTED[key]
+    return MODEL_CACHE.get(key)
+
+
+def analyze_series(data, region, parameter, backend=None):
+    series = select_series(data, region, parameter)
+    key = analysis_key(series, region, parameter, backend)
+    if key in PRECOMPUTED:
+        return PRECOMPUTED[key]
+    return MODEL_CACHE.get_or_compute(key, lambda: fit_series(series, key[2], key))
+
+
+def run_time_series_analysis(data, region, parameter, backend=None):
+    result = analyze_series(data, region, parameter, backend)
+    decomposition_fig = plot_decomposition(result['decomposition'], parameter)
+    forecast_fig = plot_forecast(result['forecast'], result['actual'], parameter)
+    return decomposition_fig, forecast_fig
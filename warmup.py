@@ -0,0 +1,93 @@
+import os
+import threading
+import time
+
+WARMUP_ENABLED = os.environ.get('FLOATCHAT_WARMUP', '1') != '0'
+
+
+def warmup_tasks():
+    from query import HARDCODED_QUESTIONS, get_response
+    from trend import analyze_series, load_trend_data, series_catalog
+
+    tasks = [
+        (f"Quick query: {question}", lambda q=question: get_response(q))
+        for question in HARDCODED_QUESTIONS
+    ]
+    data = load_trend_data()
+    for region, parameter in series_catalog().itertuples(index=False):
+        tasks.append((
+            f"Trend: {region} / {parameter}",
+            lambda r=region, p=parameter: analyze_series(data, r, p)
+        ))
+    return tasks
+
+
+class Warmup:
+    def __init__(self, tasks=warmup_tasks):
+        self._tasks = tasks
+        self._lock = threading.Lock()
+        self._thread = None
+        self.state = 'pending'
+        self.total = 0
+        self.done = 0
+        self.current = None
+        self.errors = []
+        self.started_at = None
+        self.finished_at = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='floatchat-warmup', daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def _run(self):
+        self.started_at = time.time()
+        self.state = 'running'
+        try:
+            tasks = self._tasks()
+        except Exception as exc:
+            self.errors.append(('collecting tasks', f"{type(exc).__name__}: {exc}"))
+            tasks = []
+        self.total = len(tasks)
+        for name, task in tasks:
+            self.current = name
+            try:
+                task()
+            except Exception as exc:
+                self.errors.append((name, f"{type(exc).__name__}: {exc}"))
+            self.done += 1
+        self.current = None
+        self.finished_at = time.time()
+        self.state = 'ready'
+
+    def ready(self):
+        return self.state == 'ready'
+
+    def status(self):
+        end = self.finished_at or time.time()
+        return {
+            'state': self.state,
+            'done': self.done,
+            'total': self.total,
+            'current': self.current,
+            'errors': list(self.errors),
+            'seconds': end - self.started_at if self.started_at else 0.0,
+        }
+
+
+_warmup = None
+_warmup_lock = threading.Lock()
+
+
+def start_warmup():
+    global _warmup
+    with _warmup_lock:
+        if _warmup is None:
+            _warmup = Warmup()
+            if WARMUP_ENABLED:
+                _warmup.start()
+    return _warmup